@@ -0,0 +1,197 @@
+# ============================================================
+#      EXERCISE 005 (EXTRA) — FORMATTING MILLIONS OF BIT PATTERNS
+# ============================================================
+# Companion to exercise_005_bit_shifts.py
+#
+# Problem:
+#   The exercise prints bits one value at a time:
+#       f"{val:04b}"              (format spec)
+#       bin(n)[2:].rjust(8, "0")  (string slicing + padding)
+#   Each call builds new str objects in Python. For millions of
+#   register values, this per-value work is the bottleneck.
+#
+# Idea:
+#   - A byte has only 256 values, so precompute the 8 characters for
+#     each of them once: BYTE_BITS[0b00000101] == b"00000101".
+#     Entry 256 is the separator (a newline by default).
+#   - Pack a whole chunk of values into bytes (big-endian, so the
+#     most significant byte comes first) with array.tobytes().
+#   - Spread those bytes into a preallocated array('H') of lookup
+#     indexes, with index 256 after every value:
+#         [hi, lo, 256, hi, lo, 256, ...]          (width=16)
+#     This is done with one strided slice assignment per byte column.
+#   - b"".join(map(BYTE_BITS.__getitem__, indexes)) turns every index
+#     into its characters; map and join both run in C.
+#   - With NumPy installed, the same table is a (256, 8) uint8 array and
+#     one fancy-indexing step per byte column writes straight into a
+#     preallocated (chunk, width + 1) output buffer.
+#
+#   With out= the chunks are written straight to a binary file and
+#   the buffers are reused, so memory stays at one chunk.
+#
+#   Values must fit in `width` bits: lists, arrays and NumPy arrays
+#   all raise OverflowError for negative or too large values.
+#
+# Run:
+#   python bit_format.py [count]       (demo + benchmark)
+# ============================================================
+
+import sys
+from array import array
+from itertools import islice
+from time import perf_counter
+
+try:
+    import numpy as np  # optional: vectorized table lookups
+except ImportError:
+    np = None
+
+BYTE_BITS = [f"{i:08b}".encode() for i in range(256)]
+
+# array typecode with exactly width // 8 bytes, for each supported width
+_TYPECODES = {
+    width: next(code for code in "BHILQ" if array(code).itemsize * 8 == width)
+    for width in (8, 16, 32, 64)
+}
+
+DEFAULT_CHUNK = 1 << 16
+
+
+# Values of one chunk -> big-endian bytes, width // 8 bytes per value.
+# Values that do not fit raise OverflowError, for NumPy arrays too
+# (astype() alone would wrap them around silently).
+def _pack(values, typecode):
+    if np is not None and isinstance(values, np.ndarray):
+        if values.dtype.kind not in "iub":
+            raise TypeError(f"integer values needed, not {values.dtype}")
+        itemsize = array(typecode).itemsize
+        if values.size and (int(values.min()) < 0 or int(values.max()) >> (8 * itemsize)):
+            raise OverflowError(f"values must be in 0..2**{8 * itemsize} - 1")
+        return values.astype(f">u{itemsize}").tobytes()
+    packed = array(typecode, values)
+    if packed.itemsize > 1 and sys.byteorder == "little":
+        packed.byteswap()
+    return packed.tobytes()
+
+
+# Chunks of at most `size` values. Arrays are sliced (a copy in C);
+# any other iterable is read with islice.
+def _chunks(values, size):
+    if isinstance(values, array) or (np is not None and isinstance(values, np.ndarray)):
+        for start in range(0, len(values), size):
+            yield values[start:start + size]
+        return
+    iterator = iter(values)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+class _PythonFormatter:
+    def __init__(self, width, sep, chunk_size):
+        self.nbytes = width // 8
+        self.table = BYTE_BITS + [sep]
+        self.indexes = array("H", bytes(2 * chunk_size * (self.nbytes + 1)))
+        # byte view of the indexes: element i is bytes 2i and 2i + 1
+        self.index_bytes = memoryview(self.indexes).cast("B")
+        self.low = 0 if sys.byteorder == "little" else 1
+
+    def format(self, raw, count):
+        k = self.nbytes
+        stride = 2 * (k + 1)
+        view = self.index_bytes[:count * stride]
+        for column in range(k):
+            view[2 * column + self.low::stride] = raw[column::k]
+        # 256 == 0x0100: only the high byte of the separator index is set
+        view[2 * k + 1 - self.low::stride] = b"\x01" * count
+        indexes = self.indexes if count * (k + 1) == len(self.indexes) else self.indexes[:count * (k + 1)]
+        return b"".join(map(self.table.__getitem__, indexes))
+
+
+class _NumpyFormatter:
+    def __init__(self, width, sep, chunk_size):
+        self.nbytes = width // 8
+        self.table = np.frombuffer(b"".join(BYTE_BITS), dtype=np.uint8).reshape(256, 8)
+        self.buffer = np.empty((chunk_size, width + len(sep)), dtype=np.uint8)
+        self.buffer[:, width:] = np.frombuffer(sep, dtype=np.uint8)
+
+    def format(self, raw, count):
+        k = self.nbytes
+        packed = np.frombuffer(raw, dtype=np.uint8).reshape(count, k)
+        out = self.buffer[:count]
+        for column in range(k):
+            out[:, 8 * column:8 * column + 8] = self.table[packed[:, column]]
+        return memoryview(out).cast("B")
+
+
+# Bit patterns of many values, one per line (sep), as bytes.
+# With out= (a binary file) the result is streamed and the number
+# of bytes written is returned instead.
+def format_bits(values, width=8, out=None, sep=b"\n", chunk_size=DEFAULT_CHUNK):
+    if width not in _TYPECODES:
+        raise ValueError("width must be 8, 16, 32 or 64")
+    typecode = _TYPECODES[width]
+    formatter_class = _NumpyFormatter if np is not None else _PythonFormatter
+    formatter = formatter_class(width, sep, chunk_size)
+
+    parts = []
+    written = 0
+    for chunk in _chunks(values, chunk_size):
+        text = formatter.format(_pack(chunk, typecode), len(chunk))
+        if out is not None:
+            out.write(text)
+            written += len(text)
+        else:
+            parts.append(bytes(text))
+
+    return written if out is not None else b"".join(parts)
+
+
+# ------------------------------------------------------------
+# The two idioms from exercise_005, for comparison
+# ------------------------------------------------------------
+
+def format_bits_fstring(values, width=8):
+    return "".join(f"{v:0{width}b}\n" for v in values)
+
+
+def format_bits_bin_rjust(values, width=8):
+    return "".join(bin(v)[2:].rjust(width, "0") + "\n" for v in values)
+
+
+if __name__ == "__main__":
+    print("\n# -----------------------------")
+    print("# Same output as the exercise")
+    print("# -----------------------------\n")
+
+    nums = [1, 2, 3, 4, 5, 6, 7]
+    print(format_bits(nums).decode(), end="")
+    print(format_bits([0xBEEF, 1], width=16).decode(), end="")
+    assert format_bits(nums).decode() == format_bits_bin_rjust(nums)
+
+    print("\n# -----------------------------")
+    print("# Benchmark")
+    print("# -----------------------------\n")
+
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    for width in (8, 16, 32, 64):
+        values = array(_TYPECODES[width], (i * 2654435761 % (1 << width) for i in range(count)))
+        line = f"width {width:>2}:"
+        for name, func in (
+            ("f-string", format_bits_fstring),
+            ("bin+rjust", format_bits_bin_rjust),
+            ("lookup", format_bits),
+        ):
+            start = perf_counter()
+            func(values, width)
+            seconds = perf_counter() - start
+            line += f"  {name} {count / seconds / 1e6:6.2f} M/s"
+        print(line)
+
+    start = perf_counter()
+    with open("/dev/null" if sys.platform != "win32" else "NUL", "wb") as sink:
+        format_bits(values, 64, out=sink)
+    seconds = perf_counter() - start
+    print(f"streamed to a file (width 64): {count / seconds / 1e6:.2f} M values/s")
@@ -0,0 +1,214 @@
+# ============================================================
+#          EXERCISE 002 (EXTRA) — COLLATZ STEPS WITH A CACHE
+# ============================================================
+# Companion to exercise_002_collatz_steps.py
+#
+# Problem:
+#   The exercise walks every sequence from scratch and prints each
+#   step. To get the step count for every n up to 10**8 we would
+#   repeat the same tails of the sequences over and over.
+#
+# Idea:
+#   Every Collatz sequence eventually falls below its starting value,
+#   and from there on the step count is already known. So we keep a
+#   table `steps[n]` and stop walking as soon as we reach a number
+#   that is already in the table (a cache hit).
+#
+#   The table is an array('H') (unsigned 16-bit, 2 bytes per number):
+#   no n below 10**10 needs more than 65535 steps, so 10**8 numbers
+#   fit in about 200 MB instead of several GB of Python ints.
+#   Pass `path=` to keep the table in a memory-mapped file instead.
+#
+#   0 means "not computed yet"; n = 1 needs 0 steps and is handled
+#   directly, so there is no clash.
+#
+# Printing every step is available with trace=True.
+#
+# Run:
+#   python collatz_cache.py            (demo + benchmark)
+# ============================================================
+
+import mmap
+from array import array
+from time import perf_counter
+
+
+class CollatzCache:
+    def __init__(self, size, typecode="H", path=None):
+        self.size = size
+        self.hits = 0
+        self.misses = 0
+        self._file = None
+        self._mmap = None
+
+        if path is None:
+            self.table = array(typecode, bytes(size * array(typecode).itemsize))
+        else:
+            # memory-mapped table: survives between runs and is paged in lazily
+            nbytes = size * array(typecode).itemsize
+            self._file = open(path, "a+b")
+            if self._file.seek(0, 2) < nbytes:
+                self._file.truncate(nbytes)
+            self._mmap = mmap.mmap(self._file.fileno(), nbytes)
+            self.table = memoryview(self._mmap).cast(typecode)
+
+    def close(self):
+        if self._mmap is not None:
+            self.table.release()
+            self._mmap.close()
+            self._file.close()
+            self._mmap = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    @property
+    def hit_rate(self):
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    # Number of steps needed for n to reach 1.
+    def steps(self, n):
+        if n < 1:
+            raise ValueError("n must be a positive integer")
+
+        table = self.table
+        size = self.size
+
+        if n == 1:
+            return 0
+        if n < size and table[n]:
+            self.hits += 1
+            return table[n]
+        self.misses += 1
+
+        # walk until we reach 1 or a value that is already known
+        path = []
+        value = n
+        while value != 1 and (value >= size or not table[value]):
+            path.append(value)
+            if value % 2 == 0:
+                value //= 2
+            else:
+                value = 3 * value + 1
+
+        count = 0 if value == 1 else table[value]
+
+        # fill the table backwards along the path we just walked
+        for value in reversed(path):
+            count += 1
+            if value < size:
+                table[value] = count
+        return count
+
+    # Step counts for every n in [lo, hi), returned as a compact array.
+    # The array is allocated once and filled in place (no list of ints).
+    def steps_range(self, lo, hi):
+        steps = self.steps
+        result = array("I", [0]) * max(hi - lo, 0)
+        for i, n in enumerate(range(lo, hi)):
+            result[i] = steps(n)
+        return result
+
+
+# ------------------------------------------------------------
+# Module-level API (one shared cache, grown on demand)
+# ------------------------------------------------------------
+
+_cache = CollatzCache(1 << 16)
+
+
+def _ensure_size(size):
+    global _cache
+    if size > _cache.size:
+        new_cache = CollatzCache(max(size, 2 * _cache.size))
+        new_cache.table[:_cache.size] = _cache.table
+        new_cache.hits = _cache.hits
+        new_cache.misses = _cache.misses
+        _cache = new_cache
+    return _cache
+
+
+# Prints every step like exercise_002 does. No cache: the full path is needed.
+def _trace(n):
+    step = 0
+    while n != 1:
+        if n % 2 == 0:
+            n //= 2
+        else:
+            n = 3 * n + 1
+        step += 1
+        print(step, n)
+    print("Done in", step, "steps.")
+    return step
+
+
+def collatz_steps(n, trace=False):
+    if trace:
+        return _trace(n)
+    return _cache.steps(n)
+
+
+def collatz_steps_range(lo, hi):
+    return _ensure_size(hi).steps_range(lo, hi)
+
+
+def cache_stats():
+    return {"hits": _cache.hits, "misses": _cache.misses, "hit_rate": _cache.hit_rate}
+
+
+# ------------------------------------------------------------
+# Plain loop from exercise_002 (no printing), for comparison
+# ------------------------------------------------------------
+
+def collatz_steps_plain(n):
+    step = 0
+    while n != 1:
+        if n % 2 == 0:
+            n //= 2
+        else:
+            n = 3 * n + 1
+        step += 1
+    return step
+
+
+if __name__ == "__main__":
+    print("\n# -----------------------------")
+    print("# Trace mode (same output as the exercise)")
+    print("# -----------------------------\n")
+
+    collatz_steps(6, trace=True)
+
+    print("\n# -----------------------------")
+    print("# Cached lookups")
+    print("# -----------------------------\n")
+
+    print("27 ->", collatz_steps(27))  # 111
+    print("97 ->", collatz_steps(97))  # 118
+    print("stats:", cache_stats())
+
+    print("\n# -----------------------------")
+    print("# Benchmark")
+    print("# -----------------------------\n")
+
+    limit = 1_000_000
+
+    start = perf_counter()
+    for n in range(1, limit):
+        collatz_steps_plain(n)
+    plain_seconds = perf_counter() - start
+    print(f"plain loop  {limit / plain_seconds:>12,.0f} numbers/s")
+
+    cache = CollatzCache(limit)
+    start = perf_counter()
+    result = cache.steps_range(1, limit)
+    cached_seconds = perf_counter() - start
+    print(f"cached      {limit / cached_seconds:>12,.0f} numbers/s")
+    print(f"hit rate    {cache.hit_rate:>12.1%}")
+    print(f"table size  {len(cache.table) * cache.table.itemsize / 2**20:>10.1f} MB")
+
+    best = max(range(len(result)), key=result.__getitem__)
+    print("longest chain below", limit, "starts at", best + 1, "with", result[best], "steps")
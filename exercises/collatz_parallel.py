@@ -0,0 +1,180 @@
+# ============================================================
+#        EXERCISE 002 (EXTRA) — COLLATZ RECORDS ON ALL CORES
+# ============================================================
+# Companion to exercise_002_collatz_steps.py and collatz_cache.py
+#
+# Problem:
+#   Find, for every n in [1, limit):
+#     - the n with the longest chain (most steps to reach 1)
+#     - the highest value any chain climbs to (the peak)
+#   One core needs hours for limit = 10**9.
+#
+# Idea:
+#   - One step-count table (uint16 per n) lives in shared memory,
+#     so every worker process can read what the others computed.
+#   - [1, limit) is cut into chunks that are handed out in order,
+#     low numbers first, so most walks quickly fall into known values.
+#   - A nonzero table entry is always final, so reading another
+#     worker's result without locks is safe; a zero just means
+#     "not known yet" and the worker keeps walking.
+#   - Each chunk returns only its own records; the parent reduces them.
+#
+# The peak:
+#   Walks stop at known values, so a worker does not see the whole
+#   chain of its own n. Next to the step count, the shared memory
+#   keeps one more byte per n: the bit length of the highest value
+#   on n's chain. A walk that stops at a known value combines it with
+#   its own path, so every n gets its exact peak bit length.
+#   Each chunk returns the n with the largest bit length it saw; the
+#   parent walks only those chains in full to get the exact peak and
+#   the smallest n that reaches it.
+#
+# Run:
+#   python collatz_parallel.py [limit]     (demo + scaling benchmark)
+# ============================================================
+
+import os
+import sys
+from multiprocessing import Pool, shared_memory
+from time import perf_counter
+
+CHUNK_SIZE = 1 << 16
+
+# set in every worker by _init_worker()
+_shm = None
+_table = None
+_peak_bits = None
+
+
+# Shared memory layout: `limit` uint16 step counts, then `limit` bytes
+# of peak bit lengths.
+def _init_worker(name, limit):
+    global _shm, _table, _peak_bits
+    _shm = shared_memory.SharedMemory(name=name)
+    _table = _shm.buf[:2 * limit].cast("H")
+    _peak_bits = _shm.buf[2 * limit:3 * limit]
+
+
+# Fill the tables for [lo, hi) and return this chunk's records:
+# (longest steps, n with longest steps, largest peak bit length,
+#  every n in the chunk whose peak has that bit length).
+def _solve_chunk(bounds):
+    lo, hi = bounds
+    table = _table
+    peak_bits = _peak_bits
+    size = len(table)
+
+    best_steps = -1
+    best_n = lo
+    best_bits = 0
+    candidates = []
+
+    for n in range(lo, hi):
+        if n == 1:
+            count = 0
+            bits = 1
+        else:
+            path = []
+            value = n
+            while value != 1 and (value >= size or not table[value]):
+                path.append(value)
+                if value % 2 == 0:
+                    value //= 2
+                else:
+                    value = 3 * value + 1
+
+            if value == 1:
+                count, bits = 0, 1
+            else:
+                count, bits = table[value], peak_bits[value]
+            for value in reversed(path):
+                count += 1
+                bits = max(bits, value.bit_length())  # peak of the chain from `value` on
+                if value < size:
+                    # bits first: a nonzero step count means both entries are final
+                    peak_bits[value] = bits
+                    table[value] = count
+
+        if count > best_steps:
+            best_steps = count
+            best_n = n
+        if bits > best_bits:
+            best_bits = bits
+            candidates = [n]
+        elif bits == best_bits:
+            candidates.append(n)
+
+    return best_steps, best_n, best_bits, candidates
+
+
+# Highest value on the chain of n (a full walk, no table).
+def _chain_peak(n):
+    peak = n
+    while n != 1:
+        n = n // 2 if n % 2 == 0 else 3 * n + 1
+        if n > peak:
+            peak = n
+    return peak
+
+
+def find_longest_chain(limit, workers=None, chunk_size=CHUNK_SIZE):
+    if limit < 2:
+        raise ValueError("limit must be at least 2")
+    workers = workers or os.cpu_count() or 1
+
+    shm = shared_memory.SharedMemory(create=True, size=3 * limit)
+    try:
+        shm.buf[:3 * limit] = bytes(3 * limit)
+        chunks = [(lo, min(lo + chunk_size, limit)) for lo in range(1, limit, chunk_size)]
+
+        with Pool(workers, initializer=_init_worker, initargs=(shm.name, limit)) as pool:
+            results = list(pool.imap(_solve_chunk, chunks))
+    finally:
+        shm.close()
+        shm.unlink()
+
+    # chunks come back in order, so ">" keeps the smallest n on ties
+    steps, start, _, _ = results[0]
+    for chunk_steps, chunk_start, _, _ in results[1:]:
+        if chunk_steps > steps:
+            steps, start = chunk_steps, chunk_start
+
+    # only chains whose peak has the top bit length can hold the peak
+    top_bits = max(bits for _, _, bits, _ in results)
+    peak, peak_start = 0, None
+    for _, _, bits, candidates in results:
+        if bits == top_bits:
+            for n in candidates:
+                value = _chain_peak(n)
+                if value > peak:  # candidates are in increasing n
+                    peak, peak_start = value, n
+
+    return {
+        "longest_start": start,
+        "longest_steps": steps,
+        "peak_start": peak_start,
+        "peak_value": peak,
+    }
+
+
+if __name__ == "__main__":
+    limit = int(sys.argv[1]) if len(sys.argv) > 1 else 2_000_000
+
+    print("\n# -----------------------------")
+    print("# Records below", limit)
+    print("# -----------------------------\n")
+
+    print(find_longest_chain(limit, workers=1))
+
+    print("\n# -----------------------------")
+    print("# Scaling benchmark")
+    print("# -----------------------------\n")
+
+    base = None
+    for workers in range(1, (os.cpu_count() or 1) + 1):
+        start = perf_counter()
+        find_longest_chain(limit, workers=workers)
+        seconds = perf_counter() - start
+        base = base or seconds
+        print(f"workers {workers:>3}  {seconds:8.2f} s  "
+              f"{limit / seconds:>12,.0f} numbers/s  speedup {base / seconds:5.2f}x")
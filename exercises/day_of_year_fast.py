@@ -0,0 +1,224 @@
+# ============================================================
+#      EXERCISE 007 (EXTRA) — DAY OF YEAR AND ORDINAL DATES
+# ============================================================
+# Companion to exercise_007_days_in_year.py and leap_years_fast.py
+#
+# Problem:
+#   day_of_year() in the exercise adds up the previous months one by
+#   one, calling days_in_month() (and is_leap_year()) every time.
+#   For billions of (year, month, day) triples that loop is too slow.
+#
+# Idea 1 — prefix sums:
+#   Precompute "days before month m" once for common and leap years:
+#       common: 0, 31, 59, 90, ...      leap: 0, 31, 60, 91, ...
+#   Then day_of_year = DAYS_BEFORE_MONTH[leap][month] + day, no loop.
+#
+# Idea 2 — ordinals (day 1 = 0001-01-01, like datetime.date):
+#   days before year y = 365 * (y - 1) + leap years in 1..y-1
+#   to_ordinal = days before year + day_of_year
+#
+# Idea 3 — the way back with bisect:
+#   Every 400 years have exactly 146_097 days. Inside one cycle we
+#   keep the first day of each of the 400 years in a sorted list and
+#   find the year with bisect; the month is found the same way in
+#   the DAYS_BEFORE_MONTH table.
+#
+#   Invalid dates give None, like day_of_year() in the exercise.
+#   The batch versions take columns (lists, arrays, NumPy arrays)
+#   and use 0 to mark invalid rows (0 is never a valid result).
+#
+# Run (from the exercises folder):
+#   python day_of_year_fast.py [count]     (checks + benchmark)
+# ============================================================
+
+import sys
+from array import array
+from bisect import bisect_right
+from itertools import accumulate
+from time import perf_counter
+
+from leap_years_fast import LEAP_CYCLE, leap_years_through  # run this file from the exercises folder
+
+try:
+    import numpy as np  # optional: vectorized batch versions
+except ImportError:
+    np = None
+
+# index [leap][month], month 1..12 (index 0 unused)
+DAYS_IN_MONTH = (
+    (0, 31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31),
+    (0, 31, 29, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31),
+)
+# days in all months before `month`; entry 13 is the length of the year
+DAYS_BEFORE_MONTH = tuple(
+    (0,) + tuple(accumulate(days[1:], initial=0)) for days in DAYS_IN_MONTH
+)
+
+DAYS_PER_CYCLE = 146_097  # days in 400 Gregorian years
+# first day (0-based) of each year inside a 400-year cycle starting at year 1
+YEAR_STARTS = tuple(accumulate((365 + LEAP_CYCLE[(1 + i) % 400] for i in range(400)), initial=0))
+
+
+def day_of_year(year, month, day):
+    if month < 1 or month > 12:
+        return None
+    leap = LEAP_CYCLE[year % 400]
+    if day < 1 or day > DAYS_IN_MONTH[leap][month]:
+        return None
+    return DAYS_BEFORE_MONTH[leap][month] + day
+
+
+def to_ordinal(year, month, day):
+    if year < 1:
+        return None
+    doy = day_of_year(year, month, day)
+    if doy is None:
+        return None
+    return 365 * (year - 1) + leap_years_through(year - 1) + doy
+
+
+def from_ordinal(ordinal):
+    if ordinal < 1:
+        raise ValueError("ordinal must be >= 1")
+    cycles, n = divmod(ordinal - 1, DAYS_PER_CYCLE)
+    offset = bisect_right(YEAR_STARTS, n) - 1
+    year = 400 * cycles + offset + 1
+    n -= YEAR_STARTS[offset]  # 0-based day inside the year
+
+    starts = DAYS_BEFORE_MONTH[LEAP_CYCLE[year % 400]]
+    month = bisect_right(starts, n, 1, 13) - 1
+    return year, month, n - starts[month] + 1
+
+
+# ------------------------------------------------------------
+# Batch versions (columns in, column out)
+# ------------------------------------------------------------
+
+def _np_tables():
+    leap = np.frombuffer(LEAP_CYCLE, dtype=np.uint8).astype(np.intp)
+    days_in_month = np.array(DAYS_IN_MONTH, dtype=np.int64)
+    days_before = np.array(DAYS_BEFORE_MONTH, dtype=np.int64)
+    return leap, days_in_month, days_before
+
+
+def day_of_year_many(years, months, days):
+    if np is not None and isinstance(years, np.ndarray):
+        leap_table, days_in_month, days_before = _np_tables()
+        years, months, days = (np.asarray(c, dtype=np.int64) for c in (years, months, days))
+        leap = leap_table[years % 400]
+        month_ok = (months >= 1) & (months <= 12)
+        safe_months = np.where(month_ok, months, 1)
+        valid = month_ok & (days >= 1) & (days <= days_in_month[leap, safe_months])
+        return np.where(valid, days_before[leap, safe_months] + days, 0)
+
+    return array("i", [day_of_year(y, m, d) or 0 for y, m, d in zip(years, months, days)])
+
+
+def to_ordinal_many(years, months, days):
+    if np is not None and isinstance(years, np.ndarray):
+        years = np.asarray(years, dtype=np.int64)
+        doy = day_of_year_many(years, months, days)
+        prev = years - 1
+        ordinals = 365 * prev + prev // 4 - prev // 100 + prev // 400 + doy
+        return np.where((doy > 0) & (years >= 1), ordinals, 0)
+
+    return array("q", [to_ordinal(y, m, d) or 0 for y, m, d in zip(years, months, days)])
+
+
+def from_ordinal_many(ordinals):
+    if np is not None and isinstance(ordinals, np.ndarray):
+        ordinals = np.asarray(ordinals, dtype=np.int64)
+        if ordinals.size and ordinals.min() < 1:
+            raise ValueError("ordinals must be >= 1")
+        cycles, n = np.divmod(ordinals - 1, DAYS_PER_CYCLE)
+        year_starts = np.array(YEAR_STARTS, dtype=np.int64)
+        offset = np.searchsorted(year_starts, n, side="right") - 1
+        years = 400 * cycles + offset + 1
+        n = n - year_starts[offset]
+
+        leap_table, _, days_before = _np_tables()
+        leap = leap_table[years % 400]
+        # month = number of month starts <= n, per row (12 comparisons, no loop per row)
+        months = (days_before[leap, 1:13] <= n[:, None]).sum(axis=1)
+        days = n - days_before[leap, months] + 1
+        return years, months, days
+
+    years, months, days = array("q"), array("b"), array("b")
+    for ordinal in ordinals:
+        y, m, d = from_ordinal(ordinal)
+        years.append(y)
+        months.append(m)
+        days.append(d)
+    return years, months, days
+
+
+if __name__ == "__main__":
+    from datetime import date
+
+    print("\n# -----------------------------")
+    print("# Checks against exercise_007")
+    print("# -----------------------------\n")
+
+    # imported here: exercise_007 prints its examples when imported
+    from exercise_007_days_in_year import (  # run this file from the exercises folder
+        day_of_year as day_of_year_loop,
+        days_in_month,
+        test_cases,
+    )
+
+    print()
+    for year, month in test_cases:
+        assert DAYS_IN_MONTH[LEAP_CYCLE[year % 400]][month] == days_in_month(year, month)
+        print(f"{year}-{month:02d} -> {DAYS_IN_MONTH[LEAP_CYCLE[year % 400]][month]}")
+
+    print(day_of_year(2000, 1, 30))   # 30
+    print(day_of_year(2000, 4, 29))   # 120
+    print(day_of_year(2001, 16, 1))   # None (invalid month)
+    print(day_of_year(2001, 10, 32))  # None (invalid day)
+
+    # the exercise's loop version is the oracle, including invalid input
+    for year in list(range(1896, 1905)) + list(range(1996, 2005)) + [2100, 2400]:
+        for month in range(0, 14):
+            for day in range(0, 33):
+                assert day_of_year(year, month, day) == day_of_year_loop(year, month, day)
+
+    # ordinals agree with datetime.date
+    for ordinal in list(range(1, 3000)) + list(range(700_000, 800_000, 7)) + [date.max.toordinal()]:
+        d = date.fromordinal(ordinal)
+        assert from_ordinal(ordinal) == (d.year, d.month, d.day)
+        assert to_ordinal(d.year, d.month, d.day) == ordinal
+    print("all checks passed")
+
+    print("\n# -----------------------------")
+    print("# Benchmark")
+    print("# -----------------------------\n")
+
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    ordinals = array("q", range(700_000, 700_000 + count))
+    years, months, days = from_ordinal_many(ordinals)
+
+    for name, func in (
+        ("exercise day_of_year", lambda: [day_of_year_loop(y, m, d) for y, m, d in zip(years, months, days)]),
+        ("prefix-sum day_of_year", lambda: day_of_year_many(years, months, days)),
+        ("to_ordinal_many", lambda: to_ordinal_many(years, months, days)),
+        ("from_ordinal_many", lambda: from_ordinal_many(ordinals)),
+    ):
+        start = perf_counter()
+        func()
+        seconds = perf_counter() - start
+        print(f"{name:<24} {count / seconds / 1e6:8.2f} M dates/s")
+
+    if np is not None:
+        np_ordinals = np.frombuffer(ordinals, dtype=np.int64)
+        np_years, np_months, np_days = from_ordinal_many(np_ordinals)
+        assert list(np_years) == list(years) and list(np_days) == list(days)
+        assert list(to_ordinal_many(np_years, np_months, np_days)) == list(ordinals)
+        for name, func in (
+            ("day_of_year_many numpy", lambda: day_of_year_many(np_years, np_months, np_days)),
+            ("to_ordinal_many numpy", lambda: to_ordinal_many(np_years, np_months, np_days)),
+            ("from_ordinal_many numpy", lambda: from_ordinal_many(np_ordinals)),
+        ):
+            start = perf_counter()
+            func()
+            seconds = perf_counter() - start
+            print(f"{name:<24} {count / seconds / 1e6:8.2f} M dates/s")
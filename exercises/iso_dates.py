@@ -0,0 +1,263 @@
+# ============================================================
+#      EXERCISE 007 (EXTRA) — PARSING MILLIONS OF ISO DATES
+# ============================================================
+# Companion to exercise_007_days_in_year.py and day_of_year_fast.py
+#
+# Problem:
+#   A CSV column holds dates as "YYYY-MM-DD", one per line. The usual
+#   way — line.decode(), split("-"), int() three times, validate —
+#   creates several str objects for every row.
+#
+# Idea:
+#   - Work on the raw bytes (bytes, bytearray or memoryview).
+#   - Every valid row has the same shape: 10 characters + "\n"
+#     (or "\r\n"). So a chunk of N rows is an N x 11 table of bytes,
+#     and NumPy can view it like that without copying.
+#   - Digits are byte - 48 (ord("0")); year, month and day come from
+#     a few column multiplications for all rows at once.
+#   - Validation reuses the rules from exercise_007 (through the
+#     vectorized to_ordinal_many from day_of_year_fast.py): bad
+#     characters, month 13, Feb 29 in a common year, ... all give 0.
+#   - Bad rows do not stop the parse; their indexes are reported.
+#
+#   Rows that break the fixed shape (extra spaces, missing zero
+#   padding, ...) send the chunk to a per-row fallback that still
+#   reads bytes slices, never str.
+#
+# Run (from the exercises folder):
+#   python iso_dates.py [rows]         (demo + benchmark)
+# ============================================================
+
+import io
+import random
+import sys
+from array import array
+from datetime import date
+from time import perf_counter
+
+from day_of_year_fast import to_ordinal, to_ordinal_many  # run this file from the exercises folder
+
+try:
+    import numpy as np  # optional: vectorized parsing
+    from numpy.lib.stride_tricks import as_strided
+except ImportError:
+    np = None
+
+DATE_WIDTH = 10          # len("YYYY-MM-DD")
+DIGIT_COLUMNS = [0, 1, 2, 3, 5, 6, 8, 9]
+DEFAULT_CHUNK_BYTES = 8 << 20
+BLOCK_ROWS = 1 << 16
+
+
+# ------------------------------------------------------------
+# One row (fallback path)
+# ------------------------------------------------------------
+
+# Ordinal of one "YYYY-MM-DD" row given as bytes, or None if invalid.
+def parse_date(row):
+    if row.endswith(b"\r"):
+        row = row[:-1]
+    if len(row) != DATE_WIDTH or row[4] != 45 or row[7] != 45:  # 45 == ord("-")
+        return None
+    year, month, day = row[0:4], row[5:7], row[8:10]
+    if not (year.isdigit() and month.isdigit() and day.isdigit()):
+        return None
+    return to_ordinal(int(year), int(month), int(day))
+
+
+def _parse_rows(buf, base_row):
+    ordinals = array("q")
+    invalid = array("q")
+    data = bytes(buf)
+    if data.endswith(b"\n"):
+        data = data[:-1]
+    for i, row in enumerate(data.split(b"\n") if data else []):
+        ordinal = parse_date(row)
+        if ordinal is None:
+            invalid.append(base_row + i)
+            ordinal = 0
+        ordinals.append(ordinal)
+    return ordinals, invalid
+
+
+# ------------------------------------------------------------
+# Whole chunk at once (NumPy path)
+# ------------------------------------------------------------
+
+# View the chunk as an (n, 10) byte table, or None if the rows do
+# not all have the fixed "YYYY-MM-DD\n" / "YYYY-MM-DD\r\n" shape.
+def _fixed_rows(raw):
+    length = len(raw)
+    if length and raw[length - 1] == 10:
+        length -= 1  # the last newline is optional
+        if length and raw[length - 1] == 13:
+            length -= 1  # and so is the last "\r\n"
+    if length < DATE_WIDTH:
+        return None
+    if length == DATE_WIDTH:
+        return raw[:DATE_WIDTH].reshape(1, DATE_WIDTH)
+
+    if raw[DATE_WIDTH] == 10:
+        stride = DATE_WIDTH + 1
+    elif raw[DATE_WIDTH] == 13 and length > DATE_WIDTH + 1 and raw[DATE_WIDTH + 1] == 10:
+        stride = DATE_WIDTH + 2
+    else:
+        return None
+    if (length - DATE_WIDTH) % stride:
+        return None
+    n = (length - DATE_WIDTH) // stride + 1
+
+    if not (raw[stride - 1:length:stride] == 10).all():
+        return None
+    if stride == DATE_WIDTH + 2 and not (raw[DATE_WIDTH:length:stride] == 13).all():
+        return None
+    return as_strided(raw, shape=(n, DATE_WIDTH), strides=(stride, 1), writeable=False)
+
+
+# Ordinals of an (n, 10) byte table; invalid rows get 0.
+def _parse_fixed(rows):
+    # uint8 arithmetic wraps around, so anything below "0" becomes > 9 too
+    digits = rows[:, DIGIT_COLUMNS] - np.uint8(48)
+    ok = (digits <= 9).all(axis=1)
+    ok &= (rows[:, 4] == 45) & (rows[:, 7] == 45)
+
+    digits = digits.astype(np.int32)
+    years = digits[:, 0] * 1000 + digits[:, 1] * 100 + digits[:, 2] * 10 + digits[:, 3]
+    months = digits[:, 4] * 10 + digits[:, 5]
+    days = digits[:, 6] * 10 + digits[:, 7]
+
+    ordinals = to_ordinal_many(years, months, days)
+    ordinals[~ok] = 0
+    return ordinals
+
+
+# Parse a chunk of newline-separated dates.
+# Returns (ordinals, invalid_row_indexes); invalid rows get ordinal 0.
+# base_row is added to the reported indexes (useful when streaming).
+def parse_dates(buf, base_row=0):
+    if np is not None:
+        raw = np.frombuffer(buf, dtype=np.uint8)
+        rows = _fixed_rows(raw)
+        if rows is not None:
+            # blocks of rows small enough for the temporaries to stay in cache
+            ordinals = np.empty(len(rows), dtype=np.int64)
+            for start in range(0, len(rows), BLOCK_ROWS):
+                ordinals[start:start + BLOCK_ROWS] = _parse_fixed(rows[start:start + BLOCK_ROWS])
+            return ordinals, np.flatnonzero(ordinals == 0) + base_row
+        ordinals, invalid = _parse_rows(buf, base_row)
+        return np.frombuffer(ordinals, dtype=np.int64), np.frombuffer(invalid, dtype=np.int64)
+    return _parse_rows(buf, base_row)
+
+
+# ------------------------------------------------------------
+# Streaming over a file
+# ------------------------------------------------------------
+
+# Yields (first_row, ordinals, invalid_row_indexes) for every chunk of a
+# binary file. Chunks always end on a line boundary.
+def iter_parse_dates(f, chunk_bytes=DEFAULT_CHUNK_BYTES):
+    row = 0
+    carry = b""
+    while True:
+        block = f.read(chunk_bytes)
+        if not block:
+            break
+        if carry:
+            block = carry + block
+        cut = block.rfind(b"\n") + 1
+        if cut == 0:
+            carry = block
+            continue
+        carry = block[cut:]
+        chunk = memoryview(block)[:cut]
+        ordinals, invalid = parse_dates(chunk, row)
+        yield row, ordinals, invalid
+        row += len(ordinals)
+    if carry:
+        ordinals, invalid = parse_dates(carry, row)
+        yield row, ordinals, invalid
+
+
+# ------------------------------------------------------------
+# Benchmark helpers
+# ------------------------------------------------------------
+
+def _sample(rows, bad_every=1000, seed=1):
+    rng = random.Random(seed)
+    start = date(1900, 1, 1).toordinal()
+    lines = [date.fromordinal(start + rng.randrange(200 * 365)).isoformat() for _ in range(rows)]
+    for i in range(0, rows, bad_every):
+        lines[i] = rng.choice(["2023-02-29", "2023-13-01", "20x3-01-01", "2023-04-31"])
+    return ("\n".join(lines) + "\n").encode()
+
+
+# The plain way: decode, split, int(), then the exercise's rules.
+def _parse_with_strings(data):
+    ordinals = []
+    for line in data.decode().splitlines():
+        try:
+            year, month, day = (int(part) for part in line.split("-"))
+        except ValueError:
+            ordinals.append(0)
+            continue
+        ordinals.append(to_ordinal(year, month, day) or 0)
+    return ordinals
+
+
+if __name__ == "__main__":
+    print("\n# -----------------------------")
+    print("# Parse a small column")
+    print("# -----------------------------\n")
+
+    column = b"2000-01-30\n2000-04-29\n2001-16-01\n2001-10-32\n2024-02-29\n"
+    ordinals, invalid = parse_dates(column)
+    print("ordinals:", ordinals.tolist())
+    print("invalid rows:", invalid.tolist())  # [2, 3] (month 16, day 32)
+
+    _, fallback_invalid = parse_dates(b"2000-01-30\r\n 2000-4-29\n2024-02-29")
+    print("invalid rows (fallback path):", fallback_invalid.tolist())  # [1]
+
+    crlf = column.replace(b"\n", b"\r\n")
+    crlf_ordinals, crlf_invalid = parse_dates(crlf)
+    assert crlf_ordinals.tolist() == ordinals.tolist()
+    print("invalid rows (CRLF):", crlf_invalid.tolist())  # [2, 3]
+
+    print("\n# -----------------------------")
+    print("# Benchmark")
+    print("# -----------------------------\n")
+
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 2_000_000
+    data = _sample(rows)
+    expected = _parse_with_strings(data)
+
+    start = perf_counter()
+    _parse_with_strings(data)
+    seconds = perf_counter() - start
+    print(f"{'str split + int()':<22} {rows / seconds / 1e6:8.2f} M rows/s")
+
+    start = perf_counter()
+    ordinals, invalid = _parse_rows(data, 0)
+    seconds = perf_counter() - start
+    assert list(ordinals) == expected
+    print(f"{'bytes rows':<22} {rows / seconds / 1e6:8.2f} M rows/s")
+
+    if np is not None:
+        start = perf_counter()
+        ordinals, invalid = parse_dates(data)
+        seconds = perf_counter() - start
+        assert ordinals.tolist() == expected
+        print(f"{'numpy fixed-width':<22} {rows / seconds / 1e6:8.2f} M rows/s  ({len(invalid)} invalid rows)")
+
+        crlf = data.replace(b"\n", b"\r\n")
+        start = perf_counter()
+        ordinals, invalid = parse_dates(crlf)
+        seconds = perf_counter() - start
+        assert ordinals.tolist() == expected
+        print(f"{'numpy fixed-width CRLF':<22} {rows / seconds / 1e6:8.2f} M rows/s  ({len(invalid)} invalid rows)")
+
+    start = perf_counter()
+    total_invalid = 0
+    for _, ordinals, invalid in iter_parse_dates(io.BytesIO(data), chunk_bytes=1 << 20):
+        total_invalid += len(invalid)
+    seconds = perf_counter() - start
+    print(f"{'streamed, 1 MB chunks':<22} {rows / seconds / 1e6:8.2f} M rows/s  ({total_invalid} invalid rows)")
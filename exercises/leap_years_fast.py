@@ -0,0 +1,158 @@
+# ============================================================
+#       EXERCISE 006 (EXTRA) — LEAP YEARS IN BULK
+# ============================================================
+# Companion to exercise_006_leap_years.py
+#
+# Problem:
+#   The exercise checks one year at a time with % 400, % 100, % 4.
+#   We need leap flags for hundreds of millions of years, and the
+#   number of leap years between any two years.
+#
+# Idea 1 — the 400-year cycle:
+#   The Gregorian rules repeat every 400 years (400 is divisible by
+#   4, 100 and 400). So year y is a leap year exactly when year
+#   y % 400 is, and a 400-entry table answers every question:
+#       LEAP_CYCLE[y % 400]   ->  1 or 0
+#   (y % 400 is never negative in Python, so this also works for
+#   years before year 0, using the proleptic calendar.)
+#
+# Idea 2 — counting without a loop:
+#   Leap years in 1..y:  y // 4  -  y // 100  +  y // 400
+#   (every 4th year, minus every 100th, plus every 400th again).
+#   Leap years in [start, end) is the difference of two such counts.
+#   Each cycle of 400 years has exactly 97 leap years.
+#
+# Bulk lookups (is_leap_many):
+#   NumPy arrays, and integer array.array inputs when NumPy is
+#   installed (viewed with np.frombuffer, no copy), use the table in
+#   one vectorized step. A range repeats its flags, so one period is
+#   computed and repeated. Everything else goes through map() in C.
+#
+# Run (from the exercises folder):
+#   python leap_years_fast.py [count]     (demo + benchmark)
+# ============================================================
+
+import sys
+from array import array
+from math import gcd
+from time import perf_counter
+
+try:
+    import numpy as np  # optional: vectorized lookups
+except ImportError:
+    np = None
+
+CYCLE_YEARS = 400
+LEAP_CYCLE = bytes(
+    1 if (y % 400 == 0) or (y % 4 == 0 and y % 100 != 0) else 0
+    for y in range(CYCLE_YEARS)
+)
+LEAPS_PER_CYCLE = sum(LEAP_CYCLE)  # 97
+
+_year_in_cycle = CYCLE_YEARS.__rmod__  # y -> y % 400, as a C-level callable
+_INT_TYPECODES = "bBhHiIlLqQ"  # array.array typecodes NumPy reads as the same ints
+
+
+def is_leap(year):
+    return LEAP_CYCLE[year % CYCLE_YEARS] == 1
+
+
+# Number of leap years in 1..year (a running total; works for any int).
+def leap_years_through(year):
+    return year // 4 - year // 100 + year // 400
+
+
+# Number of leap years in [start, end), like range(start, end).
+def count_leap_years(start, end):
+    if end <= start:
+        return 0
+    return leap_years_through(end - 1) - leap_years_through(start - 1)
+
+
+# Leap flags for many years at once.
+#   NumPy array -> NumPy bool array
+#   anything else (list, range, array) -> bytes of 0/1 flags
+def is_leap_many(years):
+    if np is not None and isinstance(years, np.ndarray):
+        table = np.frombuffer(LEAP_CYCLE, dtype=np.bool_)
+        if years.dtype.itemsize == 1:
+            years = years.astype(np.int16)  # 400 does not fit in 8 bits
+        return table[np.mod(years, CYCLE_YEARS)]
+    if np is not None and isinstance(years, array) and years.typecode in _INT_TYPECODES:
+        return is_leap_many(np.frombuffer(years, dtype=years.typecode)).tobytes()
+    if isinstance(years, range):
+        return _is_leap_range(years)
+    return bytes(map(LEAP_CYCLE.__getitem__, map(_year_in_cycle, years)))
+
+
+# A range repeats its flags every 400 / gcd(step, 400) years, so we
+# compute one period and repeat it with bytes * n (done in C).
+def _is_leap_range(years):
+    period = CYCLE_YEARS // gcd(years.step, CYCLE_YEARS)
+    first = bytes(LEAP_CYCLE[y % CYCLE_YEARS] for y in years[:period])
+    repeats = -(-len(years) // period)  # ceiling division
+    return (first * repeats)[:len(years)]
+
+
+def leap_years_between(start, end):
+    return [y for y in range(start, end) if LEAP_CYCLE[y % CYCLE_YEARS]]
+
+
+if __name__ == "__main__":
+    print("\n# -----------------------------")
+    print("# Same examples as the exercise")
+    print("# -----------------------------\n")
+
+    print("1996 ->", is_leap(1996))  # True
+    print("1900 ->", is_leap(1900))  # False
+    print("2000 ->", is_leap(2000))  # True
+    print("Leap years:", leap_years_between(1990, 2035))  # [1992, 1996, ..., 2032]
+    print("Count 1990..2034:", count_leap_years(1990, 2035))  # 11
+    print("Count in 10**12 years:", count_leap_years(0, 10 ** 12))  # 242_500_000_000
+
+    # the closed form agrees with the table, also for negative years
+    for start in range(-800, 800, 37):
+        for end in range(start, start + 900, 53):
+            assert count_leap_years(start, end) == sum(is_leap_many(list(range(start, end))))
+    for step in (1, -1, 3, 8, 100, 400, 1000):
+        years = range(-1234, 5678, step) if step > 0 else range(5678, -1234, step)
+        assert is_leap_many(years) == is_leap_many(list(years))
+
+    print("\n# -----------------------------")
+    print("# Benchmark")
+    print("# -----------------------------\n")
+
+    # imported here: exercise_006 prints its examples when imported
+    from exercise_006_leap_years import is_leap_year, is_leap as is_leap_exercise  # run this file from the exercises folder
+
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 2_000_000
+    years = array("q", range(1, count + 1))
+    expected = None
+
+    print()
+    for name, func in (
+        ("is_leap_year()", lambda ys: bytes(is_leap_year(y) for y in ys)),
+        ("is_leap() comprehension", lambda ys: bytes([is_leap_exercise(y) for y in ys])),
+        ("is_leap_many(array)", is_leap_many),
+        ("is_leap_many(range)", lambda ys: is_leap_many(range(1, count + 1))),
+    ):
+        start = perf_counter()
+        flags = func(years)
+        seconds = perf_counter() - start
+        expected = expected or flags
+        assert flags == expected
+        print(f"{name:<26} {count / seconds / 1e6:8.2f} M years/s")
+
+    if np is not None:
+        np_years = np.arange(1, count + 1, dtype=np.int64)
+        start = perf_counter()
+        flags = is_leap_many(np_years)
+        seconds = perf_counter() - start
+        assert flags.tobytes() == expected
+        print(f"{'is_leap_many(numpy)':<26} {count / seconds / 1e6:8.2f} M years/s")
+
+    start = perf_counter()
+    for _ in range(100_000):
+        count_leap_years(-123_456_789, 987_654_321)
+    seconds = perf_counter() - start
+    print(f"{'count_leap_years()':<26} {100_000 / seconds / 1e6:8.2f} M calls/s (any range size)")
@@ -0,0 +1,219 @@
+# ============================================================
+#       EXERCISE 004 (EXTRA) — FLAT MATRIX AND DIAGONAL SUMS
+# ============================================================
+# Companion to exercise_004_diagonal_sum.py
+#
+# Problem:
+#   The exercise stores the grid as a list of lists. Every row is its
+#   own list object and every value its own int object. For a
+#   10_000 x 10_000 grid that is 10_000 lists and 100_000_000
+#   pointers to int objects, and summing grid[i][i] is a Python loop.
+#
+# Idea:
+#   Store all values in ONE contiguous array('d') (8 bytes per value),
+#   row after row ("row-major"). Element (r, c) lives at index
+#   r * cols + c. Then:
+#
+#     - main diagonal (r, r):       start 0,          step cols + 1
+#     - diagonal k (r, r + k):      start k,          step cols + 1
+#     - anti-diagonal (r, cols-1-r): start cols - 1,  step cols - 1
+#
+#   A strided slice like data[start:stop:step] is copied in C, so
+#   trace() never touches a Python-level loop over the rows.
+#
+#   from_row_pattern() builds the exercise's [cols - c ...] row once
+#   and repeats it with array * rows, also in C, with no Python lists.
+#
+# Run:
+#   python matrix_flat.py [size]       (demo + benchmark)
+# ============================================================
+
+import sys
+import tracemalloc
+from array import array
+from time import perf_counter
+
+try:
+    import numpy as np  # optional: zero-copy view with to_numpy()
+except ImportError:
+    np = None
+
+
+class Matrix:
+    def __init__(self, rows, cols, data=None, typecode="d"):
+        if rows < 1 or cols < 1:
+            raise ValueError("rows and cols must be positive")
+        if data is None:
+            data = array(typecode, bytes(rows * cols * array(typecode).itemsize))
+        elif len(data) != rows * cols:
+            raise ValueError("data must have rows * cols values")
+        self.rows = rows
+        self.cols = cols
+        self.typecode = typecode
+        self.data = data
+
+    # -------------------- constructors --------------------
+
+    @classmethod
+    def zeros(cls, rows, cols, typecode="d"):
+        return cls(rows, cols, typecode=typecode)
+
+    # The exercise's pattern: every row is [cols, cols - 1, ..., 1].
+    @classmethod
+    def from_row_pattern(cls, rows, cols, typecode="d"):
+        row = array(typecode, range(cols, 0, -1))
+        return cls(rows, cols, row * rows, typecode)
+
+    @classmethod
+    def from_rows(cls, grid, typecode="d"):
+        rows, cols = len(grid), len(grid[0])
+        data = array(typecode)
+        for row in grid:
+            if len(row) != cols:
+                raise ValueError("all rows must have the same length")
+            data.extend(row)
+        return cls(rows, cols, data, typecode)
+
+    # -------------------- element access --------------------
+
+    @property
+    def shape(self):
+        return self.rows, self.cols
+
+    def __getitem__(self, position):
+        r, c = position
+        return self.data[r * self.cols + c]
+
+    def __setitem__(self, position, value):
+        r, c = position
+        self.data[r * self.cols + c] = value
+
+    def row(self, r):
+        start = r * self.cols
+        return self.data[start:start + self.cols]
+
+    def column(self, c):
+        return self.data[c::self.cols]
+
+    def to_rows(self):
+        return [list(self.row(r)) for r in range(self.rows)]
+
+    def to_numpy(self):
+        if np is None:
+            raise ImportError("to_numpy() needs NumPy")
+        return np.frombuffer(self.data, dtype=self.typecode).reshape(self.rows, self.cols)
+
+    # -------------------- diagonals --------------------
+
+    # Values of diagonal k: k = 0 main, k > 0 above it, k < 0 below it.
+    def diagonal(self, k=0):
+        rows, cols = self.rows, self.cols
+        if k >= 0:
+            start, length = k, min(rows, cols - k)
+        else:
+            start, length = -k * cols, min(rows + k, cols)
+        if length <= 0:
+            return array(self.typecode)
+        step = cols + 1
+        return self.data[start:start + (length - 1) * step + 1:step]
+
+    def anti_diagonal(self):
+        length = min(self.rows, self.cols)
+        if self.cols == 1:
+            return self.data[:1]
+        step = self.cols - 1
+        start = self.cols - 1
+        return self.data[start:start + (length - 1) * step + 1:step]
+
+    def trace(self):
+        return sum(self.diagonal(0))
+
+    def anti_trace(self):
+        return sum(self.anti_diagonal())
+
+    # Sum of all diagonals k1..k2 (inclusive), e.g. band_sum(-1, 1) is tridiagonal.
+    def band_sum(self, k1, k2):
+        return sum(sum(self.diagonal(k)) for k in range(k1, k2 + 1))
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.rows}, {self.cols}, typecode={self.typecode!r})"
+
+
+# ------------------------------------------------------------
+# The two list-of-lists versions from exercise_004, as functions
+# ------------------------------------------------------------
+
+def diagonal_sum_comprehension(rows, cols):
+    grid = [[cols - c for c in range(cols)] for r in range(rows)]
+    diag_sum = 0
+    for i in range(rows):
+        diag_sum += grid[i][i]
+    return grid, diag_sum
+
+
+def diagonal_sum_loops(rows, cols):
+    grid = []
+    for r in range(rows):
+        row = []
+        for c in range(cols):
+            row.append(cols - c)
+        grid.append(row)
+    diag_sum = 0
+    for i in range(rows):
+        diag_sum += grid[i][i]
+    return grid, diag_sum
+
+
+def diagonal_sum_flat(rows, cols):
+    matrix = Matrix.from_row_pattern(rows, cols)
+    return matrix, matrix.trace()
+
+
+# Time and peak memory of building the grid and summing its diagonal.
+# tracemalloc slows allocation down a lot, so time and memory are two runs.
+def _measure(func, size):
+    start = perf_counter()
+    result = func(size, size)
+    seconds = perf_counter() - start
+    del result
+
+    tracemalloc.start()
+    result = func(size, size)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return seconds, peak, result[1]
+
+
+if __name__ == "__main__":
+    print("\n# -----------------------------")
+    print("# Exercise grid (4 x 4)")
+    print("# -----------------------------\n")
+
+    m = Matrix.from_row_pattern(4, 4)
+    print("Matrix:", m.to_rows())
+    print("Main diagonal:", list(m.diagonal()), "sum", m.trace())  # 10
+    print("Anti-diagonal:", list(m.anti_diagonal()), "sum", m.anti_trace())  # 1 + 2 + 3 + 4 = 10
+    print("Diagonal +1:", list(m.diagonal(1)))  # [3, 2, 1]
+    print("Diagonal -1:", list(m.diagonal(-1)))  # [4, 3, 2]
+    print("Tridiagonal band sum:", m.band_sum(-1, 1))  # 9 + 10 + 6 = 25
+
+    print("\n# -----------------------------")
+    print("# Benchmark")
+    print("# -----------------------------\n")
+
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    print(f"grid {size} x {size}")
+    for name, func in (
+        ("comprehension", diagonal_sum_comprehension),
+        ("nested loops", diagonal_sum_loops),
+        ("flat array", diagonal_sum_flat),
+    ):
+        seconds, peak, total = _measure(func, size)
+        print(f"{name:<14} {seconds * 1000:>9.1f} ms  peak {peak / 2**20:>8.1f} MB  diagonal {total:,.0f}")
+
+    # trace only, on an already built matrix
+    m = Matrix.from_row_pattern(size, size)
+    start = perf_counter()
+    for _ in range(100):
+        m.trace()
+    print(f"trace() alone  {(perf_counter() - start) * 10:>9.3f} ms")
@@ -0,0 +1,281 @@
+# ============================================================
+#     EXERCISE 004 (EXTRA) — GRIDS BIGGER THAN RAM (MMAP)
+# ============================================================
+# Companion to exercise_004_diagonal_sum.py and matrix_flat.py
+#
+# Problem:
+#   A 50 GB square table cannot be loaded as nested lists, or even
+#   as one array('d'): it does not fit in memory.
+#
+# Idea:
+#   Keep the flat row-major layout from matrix_flat.py, but let the
+#   values live in a binary file that is memory-mapped (mmap).
+#   The operating system loads pages only when we touch them and
+#   drops them again when memory is needed, so:
+#
+#     - trace() / diagonal(k) touch one value per row -> very cheap
+#     - row_sums() / column_sums() walk the file in tiles of whole
+#       rows (tile_bytes at a time), so memory use stays bounded
+#
+#   MappedMatrix is a Matrix whose `data` is a memoryview of the
+#   mapping, so every diagonal method from matrix_flat.py just works.
+#   row(), column(), diagonal() and anti_diagonal() return array
+#   copies (as they do for an in-memory Matrix): a view would keep
+#   the file mapped and make close() fail.
+#
+# File format:
+#   32-byte header, then rows * cols values:
+#     b"GRID", version (uint32), typecode (8 bytes), rows, cols (uint64)
+#
+# Run (from the exercises folder):
+#   python matrix_mmap.py                               (small demo)
+#   python matrix_mmap.py generate grid.bin 20000 20000 [--pattern random]
+#   python matrix_mmap.py bench grid.bin [--tile 64M]
+# ============================================================
+
+import argparse
+import mmap
+import os
+import random
+import struct
+import tempfile
+from array import array
+from time import perf_counter
+
+from matrix_flat import Matrix  # run this file from the exercises folder
+
+try:
+    import numpy as np  # optional: faster tile sums
+except ImportError:
+    np = None
+
+HEADER = struct.Struct("<4sI8sQQ")
+MAGIC = b"GRID"
+VERSION = 1
+DEFAULT_TILE_BYTES = 64 << 20
+
+
+class MappedMatrix(Matrix):
+    def __init__(self, path, writable=False):
+        self.path = path
+        self._file = open(path, "r+b" if writable else "rb")
+        magic, version, typecode, rows, cols = HEADER.unpack(self._file.read(HEADER.size))
+        if magic != MAGIC or version != VERSION:
+            self._file.close()
+            raise ValueError(f"{path} is not a grid file (version {VERSION})")
+        typecode = typecode.rstrip(b"\0").decode()
+
+        itemsize = array(typecode).itemsize
+        access = mmap.ACCESS_WRITE if writable else mmap.ACCESS_READ
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=access)
+        if hasattr(self._mmap, "madvise"):
+            self._mmap.madvise(mmap.MADV_SEQUENTIAL)
+
+        self._raw = memoryview(self._mmap)[HEADER.size:HEADER.size + rows * cols * itemsize]
+        super().__init__(rows, cols, self._raw.cast(typecode), typecode)
+        self.itemsize = itemsize
+
+    # Create an empty (all zeros, sparse on disk) grid file.
+    @classmethod
+    def create(cls, path, rows, cols, typecode="d"):
+        itemsize = array(typecode).itemsize
+        with open(path, "wb") as f:
+            f.write(HEADER.pack(MAGIC, VERSION, typecode.encode(), rows, cols))
+            f.truncate(HEADER.size + rows * cols * itemsize)
+        return cls(path, writable=True)
+
+    # Raises BufferError (and stays open) while the caller still holds
+    # a view of the mapping, e.g. from to_numpy().
+    def close(self):
+        if self._mmap is None:
+            return
+        self.data.release()
+        self._raw.release()
+        try:
+            self._mmap.close()
+        except BufferError:
+            start = HEADER.size
+            self._raw = memoryview(self._mmap)[start:start + self.rows * self.cols * self.itemsize]
+            self.data = self._raw.cast(self.typecode)
+            raise
+        self._file.close()
+        self._mmap = None
+
+    # -------------------- copies instead of views --------------------
+
+    def _copy(self, values):
+        if not isinstance(values, memoryview):
+            return values
+        copy = array(self.typecode)
+        copy.frombytes(values.tobytes())
+        values.release()
+        return copy
+
+    def row(self, r):
+        return self._copy(super().row(r))
+
+    def column(self, c):
+        return self._copy(super().column(c))
+
+    def diagonal(self, k=0):
+        return self._copy(super().diagonal(k))
+
+    def anti_diagonal(self):
+        return self._copy(super().anti_diagonal())
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    # -------------------- tiled reductions --------------------
+
+    # Yields (first_row, values) for blocks of whole rows.
+    def tiles(self, tile_bytes=DEFAULT_TILE_BYTES):
+        row_bytes = self.cols * self.itemsize
+        tile_rows = max(1, tile_bytes // row_bytes)
+        for first in range(0, self.rows, tile_rows):
+            count = min(tile_rows, self.rows - first)
+            raw = self._raw[first * row_bytes:(first + count) * row_bytes]
+            if np is not None:
+                values = np.frombuffer(raw, dtype=self.typecode).reshape(count, self.cols)
+            else:
+                values = array(self.typecode)
+                values.frombytes(raw)
+            yield first, values
+            del values
+            raw.release()
+
+    def row_sums(self, tile_bytes=DEFAULT_TILE_BYTES):
+        sums = array("d")
+        cols = self.cols
+        for _, values in self.tiles(tile_bytes):
+            if np is not None:
+                sums.extend(values.sum(axis=1, dtype=np.float64).tolist())
+            else:
+                sums.extend(sum(values[i:i + cols]) for i in range(0, len(values), cols))
+        return sums
+
+    def column_sums(self, tile_bytes=DEFAULT_TILE_BYTES):
+        cols = self.cols
+        if np is not None:
+            totals = np.zeros(cols, dtype=np.float64)
+            for _, values in self.tiles(tile_bytes):
+                totals += values.sum(axis=0, dtype=np.float64)
+            return array("d", totals.tolist())
+
+        totals = array("d", bytes(8 * cols))
+        for _, values in self.tiles(tile_bytes):
+            for c in range(cols):
+                totals[c] += sum(values[c::cols])
+        return totals
+
+    def total(self, tile_bytes=DEFAULT_TILE_BYTES):
+        return sum(self.row_sums(tile_bytes))
+
+
+# ------------------------------------------------------------
+# Test data generator
+# ------------------------------------------------------------
+
+# Writes a grid file tile by tile, so it never needs the whole grid in RAM.
+#   pattern="exercise": every row is [cols, cols - 1, ..., 1]
+#   pattern="random":   uniform values in [0, 1)
+def generate(path, rows, cols, pattern="exercise", typecode="d",
+             tile_bytes=DEFAULT_TILE_BYTES, seed=0):
+    itemsize = array(typecode).itemsize
+    tile_rows = max(1, tile_bytes // (cols * itemsize))
+    rng = np.random.default_rng(seed) if np is not None else random.Random(seed)
+
+    with open(path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, typecode.encode(), rows, cols))
+        row = array(typecode, range(cols, 0, -1))
+        for first in range(0, rows, tile_rows):
+            count = min(tile_rows, rows - first)
+            if pattern == "exercise":
+                f.write((row * count).tobytes())
+            elif pattern == "random":
+                if np is not None:
+                    f.write(rng.random(count * cols).astype(typecode).tobytes())
+                else:
+                    f.write(array(typecode, (rng.random() for _ in range(count * cols))).tobytes())
+            else:
+                raise ValueError(f"unknown pattern: {pattern}")
+    return HEADER.size + rows * cols * itemsize
+
+
+# ------------------------------------------------------------
+# Benchmark
+# ------------------------------------------------------------
+
+def benchmark(path, tile_bytes=DEFAULT_TILE_BYTES):
+    with MappedMatrix(path) as m:
+        gb = m.rows * m.cols * m.itemsize / 1e9
+        print(f"{path}: {m.rows} x {m.cols} ({gb:.2f} GB)")
+
+        for name, func in (
+            ("row_sums", lambda: m.row_sums(tile_bytes)),
+            ("column_sums", lambda: m.column_sums(tile_bytes)),
+        ):
+            start = perf_counter()
+            func()
+            seconds = perf_counter() - start
+            print(f"{name:<12} {seconds:8.3f} s  {gb / seconds:6.2f} GB/s")
+
+        for name, func in (("trace", m.trace), ("anti_trace", m.anti_trace)):
+            start = perf_counter()
+            value = func()
+            seconds = perf_counter() - start
+            print(f"{name:<12} {seconds * 1000:8.3f} ms  value {value:,.1f}")
+
+
+def _parse_size(text):
+    units = {"K": 1 << 10, "M": 1 << 20, "G": 1 << 30}
+    text = text.strip().upper().rstrip("B")
+    if text and text[-1] in units:
+        return int(float(text[:-1]) * units[text[-1]])
+    return int(text)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Memory-mapped grid tools.")
+    sub = parser.add_subparsers(dest="command")
+
+    gen = sub.add_parser("generate", help="write a grid file")
+    gen.add_argument("path")
+    gen.add_argument("rows", type=int)
+    gen.add_argument("cols", type=int)
+    gen.add_argument("--pattern", choices=("exercise", "random"), default="exercise")
+
+    bench = sub.add_parser("bench", help="time reductions over a grid file")
+    bench.add_argument("path")
+    bench.add_argument("--tile", default="64M", help="tile size, e.g. 16M")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "generate":
+        start = perf_counter()
+        size = generate(args.path, args.rows, args.cols, args.pattern)
+        seconds = perf_counter() - start
+        print(f"wrote {size / 1e9:.2f} GB in {seconds:.2f} s ({size / 1e9 / seconds:.2f} GB/s)")
+    elif args.command == "bench":
+        benchmark(args.path, _parse_size(args.tile))
+    else:
+        # small demo on a temporary file
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "grid.bin")
+            generate(path, 4, 4)
+            with MappedMatrix(path) as m:
+                print(m)
+                print("Main diagonal sum:", m.trace())     # 10.0
+                print("Row sums:", list(m.row_sums()))     # [10.0, 10.0, 10.0, 10.0]
+                print("Column sums:", list(m.column_sums()))  # [16.0, 12.0, 8.0, 4.0]
+
+            path = os.path.join(tmp, "big.bin")
+            generate(path, 3000, 3000, "random")
+            benchmark(path, tile_bytes=8 << 20)
+
+
+if __name__ == "__main__":
+    main()
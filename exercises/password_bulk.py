@@ -0,0 +1,164 @@
+# ============================================================
+#      RANDOM PASSWORD (EXTRA) — MILLIONS OF PASSWORDS
+# ============================================================
+# Companion to random_password.py
+#
+# Problem:
+#   generate_password() calls random.choice() once per character.
+#   That is slow for millions of passwords, and the `random` module
+#   is predictable: it must never be used for credentials.
+#
+# Idea:
+#   - Random bytes come from the operating system (os.urandom, the
+#     same source as `secrets`) in large blocks, not one at a time.
+#   - A byte is 0..255. With an alphabet of m characters, byte % m
+#     would favour the first 256 % m characters, so bytes >= the
+#     largest multiple of m below 256 are thrown away ("rejection
+#     sampling"); every kept byte is uniform over the alphabet.
+#   - Both steps run in C with one bytes.translate() call per block:
+#     the table maps a kept byte to its character and the `delete`
+#     argument drops the rejected bytes.
+#   - Passwords are produced chunk by chunk (an iterator, or lines
+#     written to a file), so a big batch never sits in one list.
+#   - With workers > 1 the chunks are made in a process pool.
+#
+#   The alphabet must be ASCII (one byte per character), at most 256
+#   distinct characters.
+#
+# Run (from the exercises folder):
+#   python password_bulk.py [count]          (benchmark)
+#   python password_bulk.py COUNT OUT_FILE    (write COUNT passwords)
+# ============================================================
+
+import os
+import secrets
+import string
+import sys
+from multiprocessing import Pool
+from time import perf_counter
+
+DEFAULT_ALPHABET = string.ascii_letters + string.digits + string.punctuation
+DEFAULT_LENGTH = 12
+CHUNK_PASSWORDS = 50_000
+
+
+# (translate table, bytes to delete, first rejected byte) for an alphabet.
+def _byte_tables(alphabet):
+    if len(set(alphabet)) != len(alphabet):
+        raise ValueError("alphabet has repeated characters")
+    if not 1 < len(alphabet) <= 256 or not alphabet.isascii():
+        raise ValueError("alphabet must be 2..256 distinct ASCII characters")
+    m = len(alphabet)
+    limit = 256 - 256 % m  # bytes below this are used, the rest rejected
+    chars = alphabet.encode("ascii")
+    table = bytes(chars[b % m] for b in range(limit)) + bytes(256 - limit)
+    return table, bytes(range(limit, 256)), limit
+
+
+# `count * length` uniform characters from the alphabet, as ASCII bytes.
+def random_chars(count, alphabet=DEFAULT_ALPHABET, tables=None):
+    table, rejected, limit = tables or _byte_tables(alphabet)
+    out = bytearray()
+    while len(out) < count:
+        missing = count - len(out)
+        # draw a little more than the expected need, so one call usually does it
+        block = os.urandom(missing * 256 // limit + missing // 16 + 64)
+        out += block.translate(table, rejected)
+    del out[count:]
+    return bytes(out)
+
+
+def _chunk(args):
+    count, length, alphabet = args
+    return random_chars(count * length, alphabet)
+
+
+def _chunk_sizes(count, chunk_passwords):
+    for start in range(0, count, chunk_passwords):
+        yield min(chunk_passwords, count - start)
+
+
+# Yields raw chunks: bytes holding n * length characters, in order.
+def _raw_chunks(count, length, alphabet, workers, chunk_passwords):
+    _byte_tables(alphabet)  # fail early on a bad alphabet
+    tasks = ((n, length, alphabet) for n in _chunk_sizes(count, chunk_passwords))
+    if not workers or workers == 1:
+        yield from map(_chunk, tasks)
+        return
+    with Pool(workers) as pool:
+        yield from pool.imap(_chunk, tasks)
+
+
+# `count` passwords, one at a time, never all in memory.
+def generate_passwords(count, length=DEFAULT_LENGTH, alphabet=DEFAULT_ALPHABET,
+                       workers=None, chunk_passwords=CHUNK_PASSWORDS):
+    for raw in _raw_chunks(count, length, alphabet, workers, chunk_passwords):
+        text = raw.decode("ascii")
+        for start in range(0, len(text), length):
+            yield text[start:start + length]
+
+
+# Write `count` passwords, one per line, to a path or binary file.
+# Returns the number of passwords written.
+def write_passwords(target, count, length=DEFAULT_LENGTH, alphabet=DEFAULT_ALPHABET,
+                    workers=None, chunk_passwords=CHUNK_PASSWORDS):
+    if isinstance(target, (str, os.PathLike)):
+        with open(target, "wb") as f:
+            return write_passwords(f, count, length, alphabet, workers, chunk_passwords)
+    line = length + 1
+    for raw in _raw_chunks(count, length, alphabet, workers, chunk_passwords):
+        # column by column: `length` strided copies instead of one slice per password
+        n = len(raw) // length
+        lines = bytearray(b"\n") * (n * line)
+        for column in range(length):
+            lines[column::line] = raw[column::length]
+        target.write(lines)
+    return count
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 3:
+        count = int(sys.argv[1])
+        start = perf_counter()
+        write_passwords(sys.argv[2], count, workers=os.cpu_count())
+        print(f"wrote {count:,} passwords to {sys.argv[2]} in {perf_counter() - start:.2f} s")
+        sys.exit()
+
+    print("\n# -----------------------------")
+    print("# Examples")
+    print("# -----------------------------\n")
+
+    # imported here: random_password prints a password when imported
+    from random_password import generate_password  # run this file from the exercises folder
+
+    print(list(generate_passwords(3)))
+    print(list(generate_passwords(3, length=6, alphabet=string.digits)))
+
+    # every character equally likely (94 does not divide 256: no bias allowed)
+    sample = random_chars(940_000)
+    counts = [sample.count(c) for c in DEFAULT_ALPHABET.encode()]
+    print(f"character counts in 940,000 draws: min {min(counts):,}  max {max(counts):,}  (10,000 expected)")
+
+    print("\n# -----------------------------")
+    print("# Benchmark")
+    print("# -----------------------------\n")
+
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+
+    for name, make, n in (
+        ("generate_password", lambda n: [generate_password(DEFAULT_LENGTH) for _ in range(n)], count // 10),
+        ("secrets.choice", lambda n: ["".join(secrets.choice(DEFAULT_ALPHABET) for _ in range(DEFAULT_LENGTH))
+                                      for _ in range(n)], count // 10),
+        ("generate_passwords", lambda n: sum(1 for _ in generate_passwords(n)), count),
+        ("write_passwords", lambda n: write_passwords(os.devnull, n), count),
+    ):
+        start = perf_counter()
+        make(n)
+        seconds = perf_counter() - start
+        print(f"{name:<22} {n / seconds:>14,.0f} passwords/s")
+
+    for workers in range(2, (os.cpu_count() or 1) + 1):
+        start = perf_counter()
+        write_passwords(os.devnull, count, workers=workers)
+        seconds = perf_counter() - start
+        print(f"{'write_passwords x' + str(workers):<22} {count / seconds:>14,.0f} passwords/s")
@@ -0,0 +1,240 @@
+# ============================================================
+#      RANDOM PASSWORD (EXTRA) — PASSWORDS THAT MEET A POLICY
+# ============================================================
+# Companion to random_password.py and password_bulk.py
+#
+# Problem:
+#   A policy like "at least 2 digits, 2 symbols, no character twice,
+#   no look-alike characters (l, 1, O, 0, ...)" is usually met by
+#   generating passwords until one passes. For strict policies almost
+#   none pass, and the number of tries explodes.
+#
+# Idea (count first, then pick directly):
+#   Every valid password has some number of characters from each
+#   class: k_lower + k_upper + k_digits + k_symbols = length, each
+#   k at least the policy's minimum. For one such split there are
+#       length! / (k_1! k_2! ...)      ways to place the classes
+#     * a_1 ** k_1 * a_2 ** k_2 ...    ways to fill them
+#   (a = size of the class alphabet; with no repeats a ** k becomes
+#   a * (a - 1) * ... * (a - k + 1)). Python ints are exact, so:
+#     1. the total number of valid passwords N is the sum over splits
+#        -> exact entropy = log2(N) bits
+#     2. a split is picked with probability (its count) / N
+#     3. the class positions are shuffled, then each class gets its
+#        characters (sampled without replacement for "no repeats");
+#        all these choices are digits of one random number, so each
+#        password costs two calls to the OS generator
+#   Every valid password comes out with the same probability 1 / N,
+#   exactly like "retry until valid", but with no retries at all.
+#
+#   All randomness comes from `secrets` (the OS generator).
+#
+# Run (from the exercises folder):
+#   python password_policy.py          (entropy + benchmark vs retrying)
+# ============================================================
+
+import math
+import secrets
+import string
+from bisect import bisect_right
+from itertools import accumulate
+from time import perf_counter
+
+CLASSES = {
+    "lower": string.ascii_lowercase,
+    "upper": string.ascii_uppercase,
+    "digits": string.digits,
+    "symbols": string.punctuation,
+}
+AMBIGUOUS = "Il1|O0o`'\""
+
+
+class PasswordPolicy:
+    def __init__(self, length, minimums=None, no_repeats=False, exclude=AMBIGUOUS, classes=CLASSES):
+        minimums = minimums or {}
+        unknown = set(minimums) - set(classes)
+        if unknown:
+            raise ValueError(f"unknown character classes: {sorted(unknown)}")
+
+        self.length = length
+        self.no_repeats = no_repeats
+        self.names = list(classes)
+        self.alphabets = ["".join(c for c in classes[name] if c not in exclude) for name in self.names]
+        self.minimums = [minimums.get(name, 0) for name in self.names]
+        self.alphabet = "".join(self.alphabets)
+        self.class_of = {c: i for i, chars in enumerate(self.alphabets) for c in chars}
+
+        # every split (k_1, k_2, ...) and the number of passwords it gives
+        self.splits = []
+        counts = []
+        for split in self._splits(0, length):
+            counts.append(self._count(split))
+            self.splits.append(split)
+        self.cumulative = list(accumulate(counts))
+        self.total = self.cumulative[-1] if self.cumulative else 0
+        if not self.total:
+            raise ValueError("no password can meet this policy")
+
+    # All ways to split `remaining` characters over classes i, i+1, ...
+    def _splits(self, i, remaining):
+        low = self.minimums[i]
+        high = remaining
+        if self.no_repeats:
+            high = min(high, len(self.alphabets[i]))
+        if i == len(self.alphabets) - 1:
+            if low <= remaining <= high:
+                yield (remaining,)
+            return
+        for k in range(low, high + 1):
+            for rest in self._splits(i + 1, remaining - k):
+                yield (k,) + rest
+
+    def _count(self, split):
+        ways = math.factorial(self.length)
+        for k, chars in zip(split, self.alphabets):
+            ways //= math.factorial(k)
+            ways *= math.perm(len(chars), k) if self.no_repeats else len(chars) ** k
+        return ways
+
+    # Exact entropy of a password drawn uniformly from all valid ones.
+    @property
+    def entropy_bits(self):
+        return math.log2(self.total)
+
+    # Chance that a uniform random string over the allowed characters
+    # meets the policy (1 / expected number of tries when retrying).
+    @property
+    def pass_rate(self):
+        return self.total / len(self.alphabet) ** self.length
+
+    def is_valid(self, password):
+        if len(password) != self.length:
+            return False
+        if self.no_repeats and len(set(password)) != len(password):
+            return False
+        counts = [0] * len(self.alphabets)
+        for c in password:
+            i = self.class_of.get(c)
+            if i is None:
+                return False
+            counts[i] += 1
+        return all(k >= low for k, low in zip(counts, self.minimums))
+
+    def generate(self):
+        split = self.splits[bisect_right(self.cumulative, secrets.randbelow(self.total))]
+
+        # One random number below (length! * ways to fill the classes),
+        # read as mixed-radix digits: every shuffle step and character
+        # pick gets its own uniform digit, from a single call to the OS.
+        draws = math.factorial(self.length)
+        for k, chars in zip(split, self.alphabets):
+            draws *= math.perm(len(chars), k) if self.no_repeats else len(chars) ** k
+        r = secrets.randbelow(draws)
+
+        # which class goes where: shuffle a list of class numbers (Fisher-Yates)
+        positions = [i for i, k in enumerate(split) for _ in range(k)]
+        for i in range(self.length - 1, 0, -1):
+            r, j = divmod(r, i + 1)
+            positions[i], positions[j] = positions[j], positions[i]
+
+        picks = []
+        for k, chars in zip(split, self.alphabets):
+            pool = list(chars)
+            if self.no_repeats:
+                # the first k steps of a Fisher-Yates shuffle: k distinct characters
+                for t in range(k):
+                    r, j = divmod(r, len(pool) - t)
+                    pool[t], pool[t + j] = pool[t + j], pool[t]
+                picks.append(iter(pool[:k]))
+            else:
+                digits = []
+                for _ in range(k):
+                    r, j = divmod(r, len(pool))
+                    digits.append(pool[j])
+                picks.append(iter(digits))
+        return "".join([next(picks[i]) for i in positions])
+
+    # The usual way: draw from all allowed characters until one passes.
+    # Returns (password, tries).
+    def generate_by_retry(self, max_tries=None):
+        tries = 0
+        while max_tries is None or tries < max_tries:
+            tries += 1
+            password = "".join(secrets.choice(self.alphabet) for _ in range(self.length))
+            if self.is_valid(password):
+                return password, tries
+        return None, tries
+
+    def __repr__(self):
+        minimums = {n: k for n, k in zip(self.names, self.minimums) if k}
+        return f"PasswordPolicy(length={self.length}, minimums={minimums}, no_repeats={self.no_repeats})"
+
+
+# ------------------------------------------------------------
+# Benchmark helpers
+# ------------------------------------------------------------
+
+# Passwords per second from `make` within a time budget.
+def _rate(make, budget):
+    start = perf_counter()
+    done = 0
+    while perf_counter() - start < budget:
+        make()
+        done += 1
+    return done / (perf_counter() - start)
+
+
+# Retry rate within a time budget; if nothing passes, the rate is
+# estimated from the tries per second and the exact pass rate.
+def _retry_rate(policy, budget):
+    start = perf_counter()
+    found = tries = 0
+    while perf_counter() - start < budget:
+        password, used = policy.generate_by_retry(max_tries=1000)
+        tries += used
+        found += password is not None
+    seconds = perf_counter() - start
+    if found:
+        return found / seconds, False
+    return tries / seconds * policy.pass_rate, True
+
+
+if __name__ == "__main__":
+    from collections import Counter
+    from itertools import product
+
+    print("\n# -----------------------------")
+    print("# Examples")
+    print("# -----------------------------\n")
+
+    policy = PasswordPolicy(12, {"lower": 1, "upper": 1, "digits": 1, "symbols": 1})
+    print(policy, [policy.generate() for _ in range(3)])
+
+    # tiny policy: exact count and uniform output, checked by brute force
+    tiny = PasswordPolicy(3, {"digits": 1, "symbols": 1}, no_repeats=True,
+                          classes={"digits": "123", "symbols": "!?"})
+    valid = [p for p in map("".join, product(tiny.alphabet, repeat=3)) if tiny.is_valid(p)]
+    assert len(valid) == tiny.total
+    seen = Counter(tiny.generate() for _ in range(24_000))
+    assert set(seen) == set(valid)
+    print(f"tiny policy: {tiny.total} passwords, each drawn {min(seen.values())}..{max(seen.values())} "
+          f"times in 24,000 (expected {24_000 // tiny.total})")
+
+    print("\n# -----------------------------")
+    print("# Entropy and benchmark (2 s budget each)")
+    print("# -----------------------------\n")
+
+    policies = [
+        PasswordPolicy(12, {"lower": 1, "upper": 1, "digits": 1, "symbols": 1}),
+        PasswordPolicy(8, {"lower": 2, "upper": 2, "digits": 2, "symbols": 2}, no_repeats=True),
+        PasswordPolicy(10, {"digits": 8}, no_repeats=True),
+        PasswordPolicy(16, {"upper": 2, "digits": 6, "symbols": 6}, no_repeats=True),
+        PasswordPolicy(24, {"lower": 2, "upper": 2, "digits": 7, "symbols": 10}, no_repeats=True),
+    ]
+    for policy in policies:
+        assert all(policy.is_valid(policy.generate()) for _ in range(1000))
+        direct = _rate(policy.generate, budget=2.0)
+        retry, estimated = _retry_rate(policy, budget=2.0)
+        print(policy)
+        print(f"    entropy {policy.entropy_bits:7.2f} bits   retry needs {1 / policy.pass_rate:>16,.1f} tries"
+              f"   direct {direct:>9,.0f}/s   retry {retry:>12,.3f}/s{' (estimated)' if estimated else ''}")
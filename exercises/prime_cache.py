@@ -0,0 +1,220 @@
+# ============================================================
+#      EXERCISE 008 (EXTRA) — PRIME BITSET CACHE ON DISK (MMAP)
+# ============================================================
+# Companion to exercise_008_prime_numbers.py and prime_sieve.py
+#
+# Problem:
+#   Every run of exercise_008 starts from nothing and tests each
+#   number again with divisions, even though the primes never change.
+#
+# Idea:
+#   Sieve once, keep the result in a file, and map it into memory:
+#     - one bit per odd number (bit i of the data stands for 2 * i + 1),
+#       so primes below 10**9 take about 60 MB
+#     - the file is memory-mapped read-only: opening it reads only the
+#       16-byte header, and the OS loads a page only when a lookup
+#       touches it
+#     - is_prime(n) for n below the stored limit is one bit lookup
+#     - a query past the limit extends the file: only the new range
+#       is sieved (with odd_segments() from prime_sieve.py) and
+#       appended, then the header is updated and the file remapped
+#
+#   The new bits are written before the header, so a run that is
+#   killed halfway leaves a file that is still correct (just shorter).
+#
+#   The file never grows past max_limit (MAX_LIMIT = 2**34 by default,
+#   a 1 GB file). Bigger n are checked with Miller–Rabin from
+#   prime_check.py instead: sieving up to 10**15 would mean a 62 TB file.
+#
+# File format:
+#   16-byte header, then limit // 16 bytes of bits:
+#     b"PRIM", version (uint32), limit (uint64, a multiple of 16)
+#   A file with another version is rebuilt from scratch.
+#
+# Run (from the exercises folder):
+#   python prime_cache.py [limit]      (demo + cold/warm benchmark)
+# ============================================================
+
+import mmap
+import os
+import random
+import struct
+import sys
+import tempfile
+from time import perf_counter
+
+from prime_check import is_prime as miller_rabin  # run this file from the exercises folder
+from prime_sieve import odd_segments  # run this file from the exercises folder
+from prime_sieve_parallel import pack_bits  # run this file from the exercises folder
+
+HEADER = struct.Struct("<4sIQ")
+MAGIC = b"PRIM"
+VERSION = 1
+MIN_LIMIT = 1 << 20
+MAX_LIMIT = 1 << 34
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "primes.bits")
+
+
+class PrimeBitset:
+    def __init__(self, path=DEFAULT_PATH, max_limit=MAX_LIMIT):
+        self.path = path
+        self.max_limit = max(MIN_LIMIT, max_limit // 16 * 16)
+        self.limit = 0
+        self._mmap = None
+
+        if os.path.exists(path):
+            with open(path, "rb") as f:
+                header = f.read(HEADER.size)
+            if len(header) == HEADER.size:
+                magic, version, limit = HEADER.unpack(header)
+                if magic != MAGIC:
+                    raise ValueError(f"{path} is not a prime bitset file")
+                if version == VERSION:
+                    self.limit = limit
+
+        if self.limit == 0:
+            # new file, or an old version: start again from an empty one
+            with open(path, "wb") as f:
+                f.write(HEADER.pack(MAGIC, VERSION, 0))
+        else:
+            self._map()
+
+    def _map(self):
+        with open(self.path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), HEADER.size + self.limit // 16, access=mmap.ACCESS_READ)
+        if hasattr(self._mmap, "madvise"):
+            self._mmap.madvise(mmap.MADV_RANDOM)
+
+    def close(self):
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    # Make sure every number below `limit` is in the file. The limit at
+    # least doubles, so a series of growing queries sieves each number once.
+    def extend(self, limit):
+        if limit <= self.limit:
+            return
+        if limit > self.max_limit:
+            raise ValueError(f"limit {limit:,} is above max_limit {self.max_limit:,}")
+        lo = self.limit
+        hi = max(limit, 2 * lo, MIN_LIMIT)
+        hi = min((hi + 15) // 16 * 16, self.max_limit)
+
+        with open(self.path, "r+b") as f:
+            f.seek(HEADER.size + lo // 16)
+            pending = bytearray()
+            for seg_lo, segment in odd_segments(lo, hi):
+                if seg_lo == 3:
+                    pending.append(0)  # the number 1 (odd_segments starts at 3)
+                pending += segment
+                whole = len(pending) - len(pending) % 8
+                f.write(pack_bits(pending[:whole]))
+                del pending[:whole]
+            f.write(pack_bits(pending))
+            f.flush()
+            os.fsync(f.fileno())
+
+            # header last: until here the file still says the old limit
+            f.seek(0)
+            f.write(HEADER.pack(MAGIC, VERSION, hi))
+
+        self.close()
+        self.limit = hi
+        self._map()
+
+    def is_prime(self, n):
+        if n >= self.limit:
+            if n < 2:
+                return False
+            if n >= self.max_limit:
+                return miller_rabin(n)
+            self.extend(n + 1)
+        if n % 2 == 0:
+            return n == 2
+        if n < 0:
+            return False
+        # odd n is bit (n >> 1): byte n >> 4, bit (n >> 1) & 7
+        return bool(self._mmap[HEADER.size + (n >> 4)] >> ((n >> 1) & 7) & 1)
+
+
+# ------------------------------------------------------------
+# Module-level API (one cache file, opened on first use)
+# ------------------------------------------------------------
+
+_bitset = None
+
+
+def is_prime(n):
+    global _bitset
+    if n >= MAX_LIMIT:
+        return miller_rabin(n)
+    if _bitset is None:
+        _bitset = PrimeBitset()
+    return _bitset.is_prime(n)
+
+
+if __name__ == "__main__":
+    # imported here: exercise_008 prints its examples when imported
+    from exercise_008_prime_numbers import is_prime_sqrt  # run this file from the exercises folder
+
+    limit = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000_000
+    path = os.path.join(tempfile.gettempdir(), "prime_cache_demo.bits")
+    if os.path.exists(path):
+        os.remove(path)
+
+    print("\n# -----------------------------")
+    print("# Lookups")
+    print("# -----------------------------\n")
+
+    with PrimeBitset(path) as primes:
+        print([n for n in range(30) if primes.is_prime(n)])  # [2, 3, 5, ..., 29]
+        print("limit after the first query:", primes.limit)
+        assert [primes.is_prime(n) for n in range(-5, 50_000)] == [is_prime_sqrt(n) for n in range(-5, 50_000)]
+        print(primes.is_prime(5_000_011), "-> limit is now", primes.limit)
+        print(primes.is_prime(10**15 + 37), "-> past max_limit, Miller–Rabin; limit is still", primes.limit)
+
+    print("\n# -----------------------------")
+    print("# Benchmark")
+    print("# -----------------------------\n")
+
+    start = perf_counter()
+    with PrimeBitset(path) as primes:
+        primes.extend(limit)
+        size = primes.limit // 16
+    print(f"extend to {limit:,}: {perf_counter() - start:7.2f} s  ({size / 1e6:,.1f} MB file)")
+
+    rng = random.Random(8)
+    queries = [rng.randrange(limit) for _ in range(200_000)]
+
+    # cold: a fresh mapping, every page is touched for the first time
+    start = perf_counter()
+    primes = PrimeBitset(path)
+    open_seconds = perf_counter() - start
+    start = perf_counter()
+    cold = [primes.is_prime(n) for n in queries]
+    cold_seconds = perf_counter() - start
+
+    # warm: the same pages again
+    start = perf_counter()
+    warm = [primes.is_prime(n) for n in queries]
+    warm_seconds = perf_counter() - start
+    primes.close()
+    assert cold == warm
+
+    start = perf_counter()
+    slow = [is_prime_sqrt(n) for n in queries[:20_000]]
+    sqrt_seconds = perf_counter() - start
+    assert slow == cold[:20_000]
+
+    print(f"open (header only):   {open_seconds * 1e6:9.1f} us")
+    print(f"cold lookups:         {len(queries) / cold_seconds:>12,.0f} /s")
+    print(f"warm lookups:         {len(queries) / warm_seconds:>12,.0f} /s")
+    print(f"is_prime_sqrt:        {20_000 / sqrt_seconds:>12,.0f} /s")
+    os.remove(path)
@@ -0,0 +1,163 @@
+# ============================================================
+#       EXERCISE 008 (EXTRA) — FAST PRIME CHECK (MILLER–RABIN)
+# ============================================================
+# Companion to exercise_008_prime_numbers.py and prime_sieve.py
+#
+# Problem:
+#   is_prime_sqrt(n) needs up to sqrt(n) divisions. For a 19-digit
+#   prime that is about 3 * 10**9 divisions — minutes per number.
+#
+# Idea (Miller–Rabin):
+#   Write n - 1 = d * 2**s with d odd. For a prime n and any base a,
+#   Fermat's little theorem forces the sequence
+#       a**d, a**(2d), a**(4d), ..., a**(n-1)   (mod n)
+#   to either start at 1 or reach n - 1 before it reaches 1.
+#   If it does not, n is certainly composite ("a is a witness").
+#   pow(a, d, n) does this in about log2(n) multiplications.
+#
+#   Some composites fool a few bases, but it is proven that none
+#   below 3.18 * 10**23 (so every 64-bit number) fools ALL of the first
+#   12 primes as bases. With those bases the answer is exact.
+#   Above that bound the test is still a very strong probable-prime test.
+#
+# Prefilter:
+#   Most numbers have a small factor. One gcd() with the product of
+#   all primes below 1000 rejects them before any pow() call.
+#
+# Batches:
+#   is_prime_many() checks a whole iterable; with workers > 1 the
+#   numbers are split into chunks and checked in a process pool.
+#
+# Run (from the exercises folder):
+#   python prime_check.py          (demo + benchmark)
+# ============================================================
+
+import random
+from itertools import islice
+from math import gcd, prod
+from multiprocessing import Pool
+from time import perf_counter
+
+from prime_sieve import small_odd_primes  # run this file from the exercises folder
+
+SMALL_PRIMES = [2] + small_odd_primes(1000)
+SMALL_PRIMES_SET = frozenset(SMALL_PRIMES)
+SMALL_PRIMES_PRODUCT = prod(SMALL_PRIMES)
+SMALL_PRIMES_LIMIT = 1000
+
+MILLER_RABIN_BASES = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37)
+
+DEFAULT_CHUNK = 10_000
+
+
+def is_prime(n):
+    if n < SMALL_PRIMES_LIMIT:
+        return n in SMALL_PRIMES_SET
+    if gcd(n, SMALL_PRIMES_PRODUCT) != 1:
+        return False
+    if n < SMALL_PRIMES_LIMIT * SMALL_PRIMES_LIMIT:
+        return True  # no prime factor below 1000, and n < 1000**2
+
+    d = n - 1
+    s = 0
+    while d % 2 == 0:
+        d //= 2
+        s += 1
+
+    for a in MILLER_RABIN_BASES:
+        x = pow(a, d, n)
+        if x == 1 or x == n - 1:
+            continue
+        for _ in range(s - 1):
+            x = x * x % n
+            if x == n - 1:
+                break
+        else:
+            return False  # a is a witness: n is composite
+    return True
+
+
+def _check_chunk(chunk):
+    return [is_prime(n) for n in chunk]
+
+
+def _chunks(iterable, size):
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+# is_prime() for every number, in order, as a list of bools.
+def is_prime_many(numbers, workers=None, chunk_size=DEFAULT_CHUNK):
+    if not workers or workers == 1:
+        return list(map(is_prime, numbers))
+    results = []
+    with Pool(workers) as pool:
+        for chunk_result in pool.imap(_check_chunk, _chunks(numbers, chunk_size)):
+            results.extend(chunk_result)
+    return results
+
+
+# ------------------------------------------------------------
+# Benchmark helpers
+# ------------------------------------------------------------
+
+# Runs `check` over `numbers` until the time budget is used up.
+# Returns (numbers checked, checks per second).
+def _rate(check, numbers, budget):
+    start = perf_counter()
+    done = 0
+    for n in numbers:
+        check(n)
+        done += 1
+        if perf_counter() - start > budget:
+            break
+    return done, done / (perf_counter() - start)
+
+
+if __name__ == "__main__":
+    print("\n# -----------------------------")
+    print("# Examples")
+    print("# -----------------------------\n")
+
+    print([n for n in range(1, 21) if is_prime(n)])   # [2, 3, 5, 7, 11, 13, 17, 19]
+    print(is_prime(2**61 - 1))                         # True  (Mersenne prime)
+    print(is_prime(18446744073709551557))              # True  (largest 64-bit prime)
+    print(is_prime(3215031751))                        # False (fools bases 2, 3, 5, 7)
+    print(is_prime_many([97, 98, 2**31 - 1], workers=2))  # [True, False, True]
+
+    print("\n# -----------------------------")
+    print("# Benchmark (2 s budget per check and size)")
+    print("# -----------------------------\n")
+
+    # imported here: exercise_008 prints its examples when imported
+    from exercise_008_prime_numbers import is_prime_slow, is_prime_sqrt  # run this file from the exercises folder
+
+    # agree with the sieve-free checks on small numbers
+    assert [is_prime(n) for n in range(20_000)] == [is_prime_sqrt(n) for n in range(20_000)]
+
+    # A single prime costs the slow checks about n (or sqrt(n)) steps,
+    # so they only run where one prime takes well under a second.
+    max_bits = {"is_prime_slow": 24, "is_prime_sqrt": 48, "is_prime": 64}
+
+    rng = random.Random(8)
+    print()
+    for bits in (24, 32, 48, 64):
+        numbers = [rng.getrandbits(bits) | (1 << (bits - 1)) | 1 for _ in range(200_000)]
+        line = f"{bits}-bit odd numbers:"
+        for name, check in (("is_prime_slow", is_prime_slow),
+                            ("is_prime_sqrt", is_prime_sqrt),
+                            ("is_prime", is_prime)):
+            if bits > max_bits[name]:
+                line += f"  {name} {'(too slow)':>14}"
+                continue
+            done, rate = _rate(check, numbers, budget=2.0)
+            line += f"  {name} {rate:>12,.1f}/s"
+        print(line)
+
+    numbers = [rng.getrandbits(64) | 1 for _ in range(200_000)]
+    for workers in (1, 2, 4):
+        start = perf_counter()
+        is_prime_many(numbers, workers=workers)
+        seconds = perf_counter() - start
+        print(f"is_prime_many, {workers} worker(s): {len(numbers) / seconds:>12,.0f} checks/s")
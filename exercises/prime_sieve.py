@@ -0,0 +1,146 @@
+# ============================================================
+#      EXERCISE 008 (EXTRA) — SEGMENTED SIEVE OF ERATOSTHENES
+# ============================================================
+# Companion to exercise_008_prime_numbers.py
+#
+# Problem:
+#   is_prime_sqrt(n) tests one number with up to sqrt(n) divisions.
+#   Listing ALL primes up to 10**10 that way is hopeless.
+#
+# Idea (sieve):
+#   Instead of asking "is n prime?" for every n, cross out the
+#   multiples of every prime p (starting at p * p). What is left
+#   are the primes. Crossing out is one slice assignment per prime:
+#       segment[start::p] = zeros
+#   which runs in C.
+#
+# Making it fit in memory (segments):
+#   - Only odd numbers are stored (2 is handled on its own), so one
+#     byte of a bytearray stands for one odd number.
+#   - The range is processed in segments of SEGMENT_BYTES (about the
+#     size of the CPU's L2 cache), so the crossing-out stays in cache
+#     and memory does not grow with the range.
+#   - Only primes up to sqrt(hi) are needed to sieve any segment
+#     below hi; they come from a small plain sieve.
+#
+#   primes(lo, hi) is a generator over one segment at a time;
+#   prime_count(n) only counts the 1-bytes of each segment.
+#
+# Run (from the exercises folder):
+#   python prime_sieve.py [limit]      (demo + benchmark)
+# ============================================================
+
+import sys
+from itertools import compress
+from math import isqrt
+from time import perf_counter
+
+SEGMENT_BYTES = 1 << 18  # 256 KiB -> 512 Ki numbers per segment
+
+_ZEROS = memoryview(bytes(SEGMENT_BYTES))
+
+
+# Odd primes below `limit` with a plain (non-segmented) odd-only sieve.
+def small_odd_primes(limit):
+    if limit <= 3:
+        return []
+    # sieve[i] stands for the odd number 2 * i + 1
+    size = limit // 2
+    sieve = bytearray(b"\x01") * size
+    sieve[0] = 0  # 1 is not prime
+    for i in range(1, (isqrt(limit - 1) - 1) // 2 + 1):
+        if sieve[i]:
+            p = 2 * i + 1
+            start = p * p // 2
+            sieve[start::p] = bytes(len(range(start, size, p)))
+    return [2 * i + 1 for i in compress(range(size), sieve)]
+
+
+# Yields (first_odd_number, segment) where segment[i] == 1 means
+# first_odd_number + 2 * i is prime, for odd numbers in [lo, hi).
+def odd_segments(lo, hi, segment_bytes=SEGMENT_BYTES):
+    lo = max(lo, 3) | 1  # first odd number >= lo (and >= 3)
+    if lo >= hi:
+        return
+    base_primes = small_odd_primes(isqrt(hi - 1) + 1)
+    zeros = _ZEROS if segment_bytes <= SEGMENT_BYTES else memoryview(bytes(segment_bytes))
+
+    # next odd multiple of each base prime that still has to be crossed out
+    next_multiple = []
+    for p in base_primes:
+        start = max(p * p, (lo + p - 1) // p * p)
+        if start % 2 == 0:
+            start += p
+        next_multiple.append(start)
+
+    span = 2 * segment_bytes
+    for seg_lo in range(lo, hi, span):
+        seg_hi = min(seg_lo + span, hi)
+        size = (seg_hi - seg_lo + 1) // 2
+        segment = bytearray(b"\x01") * size
+
+        for k, p in enumerate(base_primes):
+            start = next_multiple[k]
+            if start >= seg_hi:
+                if p * p >= seg_hi:
+                    break  # larger primes start even later
+                continue
+            index = (start - seg_lo) // 2
+            count = (size - 1 - index) // p + 1
+            segment[index::p] = zeros[:count]
+            next_multiple[k] = start + 2 * p * count
+
+        yield seg_lo, segment
+
+
+# All primes in [lo, hi), in order, one segment in memory at a time.
+def primes(lo, hi):
+    if lo <= 2 < hi:
+        yield 2
+    for seg_lo, segment in odd_segments(lo, hi):
+        yield from compress(range(seg_lo, seg_lo + 2 * len(segment), 2), segment)
+
+
+# Number of primes <= n.
+def prime_count(n):
+    if n < 2:
+        return 0
+    return 1 + sum(segment.count(1) for _, segment in odd_segments(3, n + 1))
+
+
+if __name__ == "__main__":
+    print("\n# -----------------------------")
+    print("# Primes")
+    print("# -----------------------------\n")
+
+    print(*primes(1, 21))                    # 2 3 5 7 11 13 17 19
+    print(*primes(10**12, 10**12 + 100))     # the primes just above 10**12
+    for n in (10, 100, 10**6, 10**7):
+        print(f"pi({n}) = {prime_count(n)}")  # 4, 25, 78498, 664579
+
+    print("\n# -----------------------------")
+    print("# Benchmark")
+    print("# -----------------------------\n")
+
+    # imported here: exercise_008 prints its examples when imported
+    from exercise_008_prime_numbers import is_prime_sqrt  # run this file from the exercises folder
+
+    limit = int(sys.argv[1]) if len(sys.argv) > 1 else 2_000_000
+
+    start = perf_counter()
+    slow = [n for n in range(limit) if is_prime_sqrt(n)]
+    slow_seconds = perf_counter() - start
+
+    start = perf_counter()
+    fast = list(primes(0, limit))
+    sieve_seconds = perf_counter() - start
+    assert slow == fast
+
+    start = perf_counter()
+    count = prime_count(limit * 100)
+    count_seconds = perf_counter() - start
+
+    print()
+    print(f"is_prime_sqrt for every n < {limit:,}: {slow_seconds:8.3f} s")
+    print(f"primes(0, {limit:,}):            {sieve_seconds:8.3f} s  ({slow_seconds / sieve_seconds:.0f}x faster)")
+    print(f"prime_count({limit * 100:,}):     {count_seconds:8.3f} s  -> {count:,} primes")
@@ -0,0 +1,153 @@
+# ============================================================
+#      EXERCISE 008 (EXTRA) — PARALLEL SIEVE IN SHARED MEMORY
+# ============================================================
+# Companion to exercise_008_prime_numbers.py and prime_sieve.py
+#
+# Problem:
+#   The segmented sieve in prime_sieve.py runs on one core. Building
+#   a prime table up to 10**11 that way takes too long for a nightly job.
+#
+# Idea:
+#   - The result is a bitset in multiprocessing.shared_memory:
+#     bit i stands for the odd number base + 2 * i (base = first odd
+#     number >= lo). 8 odd numbers per byte, so 10**11 fits in ~6 GB.
+#   - [lo, hi) is cut into tasks that start on a byte boundary
+#     (every 16 numbers), so no two workers ever write the same byte
+#     and no locks are needed.
+#   - Each worker sieves its task with odd_segments() from
+#     prime_sieve.py (one byte per odd number, cache-sized segments)
+#     and packs the bytes into bits before writing them.
+#   - Counting is a second parallel pass: every worker pop-counts its
+#     own slice of the bitset with int.bit_count().
+#
+# Run (from the exercises folder):
+#   python prime_sieve_parallel.py [hi]      (demo + scaling report)
+# ============================================================
+
+import os
+import sys
+from multiprocessing import Pool, shared_memory
+from time import perf_counter
+
+from prime_sieve import odd_segments  # run this file from the exercises folder
+
+TASK_BYTES = 1 << 19          # bitset bytes per task = 4 Mi odd numbers
+COUNT_BYTES = 1 << 22         # bitset bytes per pop-count task
+
+# 0 -> "0", 1 -> "1", used to turn a 0/1 bytearray into a binary string
+_TO_DIGITS = bytes.maketrans(b"\x00\x01", b"01")
+
+_shm = None  # set in every worker by _init_worker()
+
+
+def _init_worker(name):
+    global _shm
+    _shm = shared_memory.SharedMemory(name=name)
+
+
+# 0/1 bytes -> packed bits, element 0 in the lowest bit of byte 0.
+# int(..., 2) and int.to_bytes() both run in C.
+def pack_bits(flags):
+    if not flags:
+        return b""
+    value = int(flags.translate(_TO_DIGITS)[::-1], 2)
+    return value.to_bytes((len(flags) + 7) // 8, "little")
+
+
+def _sieve_task(args):
+    base, hi, first_byte, last_byte = args
+    task_lo = base + 16 * first_byte
+    task_hi = min(base + 16 * last_byte, hi)
+    flags = bytearray((task_hi - task_lo + 1) // 2)
+    for seg_lo, segment in odd_segments(task_lo, task_hi):
+        start = (seg_lo - task_lo) // 2
+        flags[start:start + len(segment)] = segment
+    bits = pack_bits(flags)
+    _shm.buf[first_byte:first_byte + len(bits)] = bits
+    return len(bits)
+
+
+def _count_task(bounds):
+    start, stop = bounds
+    return int.from_bytes(_shm.buf[start:stop], "little").bit_count()
+
+
+class SharedPrimeTable:
+    def __init__(self, lo, hi, workers=None):
+        if hi <= lo:
+            raise ValueError("hi must be greater than lo")
+        self.lo = lo
+        self.hi = hi
+        self.base = lo | 1
+        self.workers = workers or os.cpu_count() or 1
+        self.nbytes = max(1, (hi - self.base + 15) // 16)
+        self.shm = shared_memory.SharedMemory(create=True, size=self.nbytes)
+        self._pool = Pool(self.workers, initializer=_init_worker, initargs=(self.shm.name,))
+
+        tasks = [
+            (self.base, hi, start, min(start + TASK_BYTES, self.nbytes))
+            for start in range(0, self.nbytes, TASK_BYTES)
+        ]
+        for _ in self._pool.imap_unordered(_sieve_task, tasks):
+            pass
+
+    # Number of primes in [lo, hi).
+    def count(self):
+        tasks = [(start, min(start + COUNT_BYTES, self.nbytes))
+                 for start in range(0, self.nbytes, COUNT_BYTES)]
+        total = sum(self._pool.imap_unordered(_count_task, tasks))
+        return total + (1 if self.lo <= 2 < self.hi else 0)
+
+    def is_prime(self, n):
+        if not self.lo <= n < self.hi:
+            raise ValueError(f"{n} is outside [{self.lo}, {self.hi})")
+        if n % 2 == 0:
+            return n == 2
+        index = (n - self.base) // 2
+        return bool(self.shm.buf[index >> 3] >> (index & 7) & 1)
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.close()
+            self._pool.join()
+            self._pool = None
+            self.shm.close()
+            self.shm.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def parallel_prime_count(lo, hi, workers=None):
+    with SharedPrimeTable(lo, hi, workers) as table:
+        return table.count()
+
+
+if __name__ == "__main__":
+    print("\n# -----------------------------")
+    print("# Small table")
+    print("# -----------------------------\n")
+
+    with SharedPrimeTable(0, 100, workers=2) as table:
+        print([n for n in range(100) if table.is_prime(n)])
+        print("count:", table.count())  # 25
+
+    print("\n# -----------------------------")
+    print("# Scaling report")
+    print("# -----------------------------\n")
+
+    hi = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000_000
+    base_seconds = None
+    for workers in range(1, (os.cpu_count() or 1) + 1):
+        start = perf_counter()
+        with SharedPrimeTable(0, hi, workers) as table:
+            sieve_seconds = perf_counter() - start
+            count = table.count()
+        seconds = perf_counter() - start
+        base_seconds = base_seconds or seconds
+        print(f"workers {workers:>3}: pi({hi:,}) = {count:,}  sieve {sieve_seconds:7.2f} s  "
+              f"total {seconds:7.2f} s  speedup {base_seconds / seconds:5.2f}x  "
+              f"({hi / seconds / 1e6:,.0f} M numbers/s)")
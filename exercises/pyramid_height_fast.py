@@ -0,0 +1,208 @@
+# ============================================================
+#          EXERCISE 001 (EXTRA) — PYRAMID HEIGHT, FAST
+# ============================================================
+# Companion to exercise_001_pyramid_height.py
+#
+# Problem:
+#   The loop solutions subtract one layer at a time, so they need
+#   about sqrt(2 * blocks) iterations. For 10**30 blocks that is
+#   more than 10**15 steps — the loop never finishes.
+#
+# Idea:
+#   A pyramid of height h needs 1 + 2 + ... + h = h * (h + 1) / 2 blocks.
+#   The height is the largest h with h * (h + 1) / 2 <= blocks.
+#   Solving the quadratic gives:
+#
+#       h = (isqrt(8 * blocks + 1) - 1) // 2
+#
+#   math.isqrt() works on Python ints of any size and is exact,
+#   so there is no float rounding, even for 10**100 blocks.
+#
+# Batch mode:
+#   pyramid_heights() accepts a list, an array('q') or a NumPy array
+#   and returns (heights, leftovers) of the same kind (and dtype).
+#   With NumPy installed, integer arrays (array.array too) are solved
+#   in one vectorized step; without it they take the per-item loop.
+#
+# Run:
+#   python pyramid_height_fast.py            (demo + benchmark)
+# ============================================================
+
+from array import array
+from math import isqrt
+from time import perf_counter
+
+try:
+    import numpy as np  # optional: only used for NumPy input
+except ImportError:
+    np = None
+
+
+# ------------------------------------------------------------
+# Single value — O(1)
+# ------------------------------------------------------------
+
+# Number of complete layers that can be built from `blocks`.
+def pyramid_height(blocks):
+    if blocks < 0:
+        raise ValueError("blocks must be a non-negative integer")
+    return (isqrt(8 * blocks + 1) - 1) // 2
+
+
+# Blocks needed for a pyramid of height h (triangular number).
+def blocks_for_height(height):
+    return height * (height + 1) // 2
+
+
+# ------------------------------------------------------------
+# Batch — many block counts in one call
+# ------------------------------------------------------------
+
+# NumPy path: float sqrt gives a guess, integer checks fix it.
+# In uint64, T(h + 1) cannot overflow while blocks < 2**63; the rare
+# bigger uint64 values go through the exact pyramid_height() instead.
+# Results have the input's integer dtype (they are never bigger than blocks).
+def _pyramid_heights_numpy(blocks):
+    b = np.asarray(blocks)
+    if b.size and b.min() < 0:
+        raise ValueError("blocks must be non-negative")
+    dtype = b.dtype if b.dtype.kind in "iu" else np.dtype(np.int64)
+    b = b.astype(np.uint64)
+    big = b >> np.uint64(63) != 0
+    has_big = bool(big.any())
+    if has_big:
+        b_exact = b
+        b = np.where(big, np.uint64(0), b)
+
+    guess = np.floor((np.sqrt(8.0 * b.astype(np.float64) + 1.0) - 1.0) / 2.0)
+    h = guess.astype(np.uint64)
+
+    def tri(x):
+        # x * (x + 1) / 2 without overflowing: halve the even factor first
+        even = x % 2 == 0
+        return np.where(even, (x // 2) * (x + 1), x * ((x + 1) // 2))
+
+    # the float guess can be off by one in either direction
+    h -= (tri(h) > b).astype(np.uint64)
+    h += (tri(h + 1) <= b).astype(np.uint64)
+    leftover = b - tri(h)
+
+    if has_big:
+        for i in np.flatnonzero(big):
+            value = int(b_exact.flat[i])
+            h.flat[i] = height = pyramid_height(value)
+            leftover.flat[i] = value - blocks_for_height(height)
+    return h.astype(dtype), leftover.astype(dtype)
+
+
+# array.array typecodes that NumPy reads as the same ints
+_INT_TYPECODES = "bBhHiIlLqQ"
+
+
+def pyramid_heights(blocks):
+    if np is not None and isinstance(blocks, np.ndarray):
+        return _pyramid_heights_numpy(blocks)
+    if np is not None and isinstance(blocks, array) and blocks.typecode in _INT_TYPECODES:
+        # viewed without a copy; the results go back into arrays of the same type
+        heights, leftovers = _pyramid_heights_numpy(np.frombuffer(blocks, dtype=blocks.typecode))
+        return array(blocks.typecode, heights.tobytes()), array(blocks.typecode, leftovers.tobytes())
+
+    heights = []
+    leftovers = []
+    for b in blocks:
+        h = pyramid_height(b)
+        heights.append(h)
+        leftovers.append(b - blocks_for_height(h))
+
+    if isinstance(blocks, array):
+        return array(blocks.typecode, heights), array(blocks.typecode, leftovers)
+    return heights, leftovers
+
+
+# ------------------------------------------------------------
+# The two loop versions from exercise_001, as functions
+# ------------------------------------------------------------
+
+def pyramid_height_while(blocks):
+    height = 0
+    current_layer_blocks = 1
+    while blocks >= current_layer_blocks:
+        blocks -= current_layer_blocks
+        current_layer_blocks += 1
+        height += 1
+    return height
+
+
+def pyramid_height_for(blocks):
+    height = 0
+    for current_layer_blocks in range(1, blocks + 1):
+        if blocks < current_layer_blocks:
+            break
+        blocks -= current_layer_blocks
+        height += 1
+    return height
+
+
+# ------------------------------------------------------------
+# Benchmark helpers
+# ------------------------------------------------------------
+
+def _time_it(func, values):
+    start = perf_counter()
+    for v in values:
+        func(v)
+    return perf_counter() - start
+
+
+if __name__ == "__main__":
+    print("\n# -----------------------------")
+    print("# Closed form vs the loops")
+    print("# -----------------------------\n")
+
+    for b in (0, 1, 2, 3, 6, 10, 20, 1000):
+        assert pyramid_height(b) == pyramid_height_while(b) == pyramid_height_for(b)
+        print(b, "blocks -> height", pyramid_height(b))
+
+    huge = 10 ** 30
+    h = pyramid_height(huge)
+    print("10**30 blocks -> height", h, "leftover", huge - blocks_for_height(h))
+
+    print("\n# -----------------------------")
+    print("# Batch")
+    print("# -----------------------------\n")
+
+    print(pyramid_heights([0, 1, 5, 10, 10 ** 20]))
+    print(pyramid_heights(array("q", [0, 1, 5, 10, 2 ** 63 - 1])))
+    if np is not None:
+        # above 2**63 (uint64 only) the exact path takes over
+        print(pyramid_heights(np.array([2 ** 63, 2 ** 64 - 1], dtype=np.uint64)))  # heights 4294967295, 6074000999
+
+    print("\n# -----------------------------")
+    print("# Benchmark")
+    print("# -----------------------------\n")
+
+    values = list(range(0, 2_000_000, 997))  # ~2000 block counts
+    for name, func in (
+        ("while loop", pyramid_height_while),
+        ("for loop", pyramid_height_for),
+        ("isqrt", pyramid_height),
+    ):
+        seconds = _time_it(func, values)
+        print(f"{name:<12} {len(values) / seconds:>14,.0f} values/s")
+
+    batch = array("q", range(1_000_000))
+    start = perf_counter()
+    pyramid_heights(batch)
+    seconds = perf_counter() - start
+    print(f"{'batch array':<12} {len(batch) / seconds:>14,.0f} values/s")
+
+    if np is not None:
+        big = np.arange(10_000_000, dtype=np.int64) * 977
+        start = perf_counter()
+        heights, leftovers = pyramid_heights(big)
+        seconds = perf_counter() - start
+        print(f"{'batch numpy':<12} {len(big) / seconds:>14,.0f} values/s")
+
+        # spot-check against the exact integer formula
+        for i in (0, 1, 12345, len(big) - 1):
+            assert heights[i] == pyramid_height(int(big[i]))
@@ -0,0 +1,139 @@
+# ============================================================
+#      EXERCISE 005 (EXTRA) — SHIFT VS MULTIPLY BENCHMARK
+# ============================================================
+# Companion to exercise_005_bit_shifts.py
+#
+# Question:
+#   The exercise shows that n << 1 and n * 2 give the same result.
+#   Is one of them faster? And n >> 1 vs n // 2?
+#
+#   Same results (for every int, also negative ones):
+#       n << k  ==  n * 2**k
+#       n >> k  ==  n // 2**k      (both round towards minus infinity)
+#
+# What we time:
+#   - small ints       (fit in one machine word)
+#   - big ints         (10**3 .. 10**6 bits; cost grows with the size)
+#   - NumPy int64 arrays (one operation over a million values)
+#
+# Output:
+#   A summary table on the console, and with --json a file that can be
+#   compared across Python versions to catch regressions.
+#
+# Run:
+#   python shift_benchmark.py
+#   python shift_benchmark.py --json results.json --repeat 7
+# ============================================================
+
+import argparse
+import json
+import platform
+import sys
+import timeit
+from datetime import datetime, timezone
+
+try:
+    import numpy as np  # optional: array cases are skipped without it
+except ImportError:
+    np = None
+
+# (name, statement, equivalent statement)
+OPERATIONS = [
+    ("double", "x << 1", "x * 2"),
+    ("times 8", "x << 3", "x * 8"),
+    ("halve", "x >> 1", "x // 2"),
+    ("div 8", "x >> 3", "x // 8"),
+]
+
+BIG_INT_BITS = [1_000, 10_000, 100_000, 1_000_000]
+ARRAY_SIZE = 1_000_000
+
+
+def _cases():
+    yield "small int", "x = 12345", {}
+    yield "small int (negative)", "x = -12345", {}
+    for bits in BIG_INT_BITS:
+        yield f"big int {bits} bits", f"x = (1 << {bits}) - 12345", {}
+    if np is not None:
+        yield f"numpy int64[{ARRAY_SIZE}]", (
+            f"x = np.arange({ARRAY_SIZE}, dtype=np.int64) - {ARRAY_SIZE // 2}"
+        ), {"np": np}
+
+
+# Best-of-`repeat` time per operation, in nanoseconds.
+def _time(statement, setup, namespace, repeat):
+    timer = timeit.Timer(statement, setup=setup, globals=namespace)
+    number, _ = timer.autorange()
+    best = min(timer.repeat(repeat=repeat, number=number))
+    return best / number * 1e9
+
+
+def run(repeat=5):
+    results = []
+    for case, setup, namespace in _cases():
+        for name, shift_stmt, arith_stmt in OPERATIONS:
+            # sanity check: both forms must agree before we time them
+            scope = dict(namespace)
+            exec(setup, scope)
+            a, b = eval(shift_stmt, scope), eval(arith_stmt, scope)
+            same = bool((a == b).all()) if np is not None and isinstance(a, np.ndarray) else a == b
+            if not same:
+                raise AssertionError(f"{shift_stmt} != {arith_stmt} for {case}")
+
+            shift_ns = _time(shift_stmt, setup, namespace, repeat)
+            arith_ns = _time(arith_stmt, setup, namespace, repeat)
+            results.append({
+                "case": case,
+                "operation": name,
+                "shift": shift_stmt,
+                "arithmetic": arith_stmt,
+                "shift_ns": round(shift_ns, 2),
+                "arithmetic_ns": round(arith_ns, 2),
+                "ratio": round(arith_ns / shift_ns, 3),
+            })
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "numpy": np.__version__ if np is not None else None,
+        "machine": platform.machine(),
+        "platform": platform.platform(),
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "repeat": repeat,
+        "results": results,
+    }
+
+
+def print_table(report):
+    print(f"Python {report['python']} ({report['implementation']}), "
+          f"NumPy {report['numpy'] or 'not installed'}, {report['machine']}\n")
+    header = f"{'case':<26} {'shift':<8} {'ns':>12}   {'arith':<8} {'ns':>12}   {'arith/shift':>11}"
+    print(header)
+    print("-" * len(header))
+    for row in report["results"]:
+        print(f"{row['case']:<26} {row['shift']:<8} {row['shift_ns']:>12,.1f}   "
+              f"{row['arithmetic']:<8} {row['arithmetic_ns']:>12,.1f}   {row['ratio']:>11.2f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time << / >> against * / // for ints and arrays.")
+    parser.add_argument("--json", metavar="PATH", help="also write the results as JSON ('-' for stdout)")
+    parser.add_argument("--repeat", type=int, default=5, help="timing repeats, best one is kept")
+    args = parser.parse_args(argv)
+
+    report = run(args.repeat)
+
+    if args.json == "-":
+        json.dump(report, sys.stdout, indent=2)
+        print()
+        return 0
+
+    print_table(report)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nwrote {args.json}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,310 @@
+# ============================================================
+#      EXERCISE 010 (EXTRA) — TIC-TAC-TOE ON BITBOARDS
+# ============================================================
+# Companion to exercise_010_tic_tac_toe.py
+#
+# Problem:
+#   The exercise keeps the board as a 3 x 3 list of strings, so
+#   victory_for() and make_list_of_free_fields() have to scan all
+#   nine cells (and compare strings) every time they are called.
+#
+# Idea (bitboards):
+#   - Square s (1..9, numbered row by row like in the exercise) is
+#     bit s - 1. Each player is one 9-bit int: X and O.
+#   - A line (row, column or diagonal) is also a 9-bit mask; there
+#     are only 8 of them, so they are written out once in WIN_MASKS.
+#   - There are only 2**9 = 512 possible sets of squares per player,
+#     so "does this set contain a line?" is precomputed for all of
+#     them: victory_for() is one table lookup.
+#   - The free squares are FULL ^ (X | O). Their list is read from
+#     another 512-entry table.
+#
+#   display_board(), enter_move(), make_list_of_free_fields(),
+#   victory_for() and draw_move() keep the exercise's interface, but
+#   take a Board instead of a list of lists.
+#
+# Rendering:
+#   The exercise's display_board() makes about 25 print() calls per
+#   board. Here the text comes from one template, is cached per board
+#   (there are only 3**9 of them) and is written with one write() to
+#   any stream (sys.stdout by default).
+#
+# Run (from the exercises folder):
+#   python tic_tac_toe_bitboard.py          (benchmark)
+#   python tic_tac_toe_bitboard.py play     (play against the computer)
+# ============================================================
+
+import io
+import random
+import sys
+from contextlib import redirect_stdout
+from time import perf_counter
+
+FULL = 0b111_111_111
+
+WIN_MASKS = (
+    0b000_000_111, 0b000_111_000, 0b111_000_000,  # rows
+    0b001_001_001, 0b010_010_010, 0b100_100_100,  # columns
+    0b100_010_001, 0b001_010_100,                 # diagonals
+)
+
+# WINNING[bits] is True if the squares in `bits` contain a whole line
+WINNING = tuple(any(bits & mask == mask for mask in WIN_MASKS) for bits in range(1 << 9))
+
+# FREE_SQUARES[bits] are the square numbers (1..9) of the set bits
+FREE_SQUARES = tuple(tuple(s + 1 for s in range(9) if bits >> s & 1) for bits in range(1 << 9))
+
+# FREE_FIELDS[bits] is the same as (row, column) pairs, like in the exercise
+FREE_FIELDS = tuple(tuple(divmod(s - 1, 3) for s in squares) for squares in FREE_SQUARES)
+
+# the exercise's board, character for character, as one format string
+_LINE = "+ ------------- +\n"
+BOARD_TEMPLATE = (_LINE + "|  {} |  {} |  {}  | \n") * 3 + _LINE
+
+_board_texts = {}  # board.key -> rendered board
+
+
+class Board:
+    __slots__ = ("x", "o")
+
+    def __init__(self, x=0, o=0):
+        self.x = x
+        self.o = o
+
+    # Board from the exercise's 3 x 3 list ("X", "O" or the square number).
+    @classmethod
+    def from_rows(cls, rows):
+        x = o = 0
+        for s, cell in enumerate(cell for row in rows for cell in row):
+            if cell == "X":
+                x |= 1 << s
+            elif cell == "O":
+                o |= 1 << s
+        return cls(x, o)
+
+    def to_rows(self):
+        cells = [self.sign_at(s) or str(s) for s in range(1, 10)]
+        return [cells[0:3], cells[3:6], cells[6:9]]
+
+    # One int for the whole position (X in the low 9 bits, O above).
+    @property
+    def key(self):
+        return self.x | self.o << 9
+
+    @property
+    def free(self):
+        return FULL ^ (self.x | self.o)
+
+    def sign_at(self, square):
+        bit = 1 << (square - 1)
+        if self.x & bit:
+            return "X"
+        if self.o & bit:
+            return "O"
+        return None
+
+    def play(self, square, sign):
+        bit = 1 << (square - 1)
+        if not 1 <= square <= 9 or (self.x | self.o) & bit:
+            raise ValueError(f"square {square} is not free")
+        if sign == "X":
+            self.x |= bit
+        else:
+            self.o |= bit
+
+    def copy(self):
+        return Board(self.x, self.o)
+
+    def __eq__(self, other):
+        return isinstance(other, Board) and self.x == other.x and self.o == other.o
+
+    def __hash__(self):
+        return self.key
+
+    def __repr__(self):
+        return f"Board(x=0b{self.x:09b}, o=0b{self.o:09b})"
+
+
+def new_board():
+    board = Board()
+    board.play(5, "X")  # the computer always starts in the center
+    return board
+
+
+# ------------------------------------------------------------
+# The exercise's functions
+# ------------------------------------------------------------
+
+# The text display_board() writes, built once per board state.
+def render_board(board):
+    text = _board_texts.get(board.key)
+    if text is None:
+        cells = [board.sign_at(s) or str(s) for s in range(1, 10)]
+        text = _board_texts[board.key] = BOARD_TEMPLATE.format(*cells)
+    return text
+
+
+# Also accepts the exercise's 3 x 3 list of lists.
+def display_board(board, file=None):
+    if not isinstance(board, Board):
+        board = Board.from_rows(board)
+    (file or sys.stdout).write(render_board(board))
+
+
+# Asks for a free square (1..9) until it gets one and puts an O there.
+def enter_move(board, read=input):
+    while True:
+        try:
+            move = int(read("make your move: "))
+        except ValueError:
+            print("use only numbers from 1 to 9")
+            continue
+        if not 1 <= move <= 9:
+            print("use only numbers from 1 to 9")
+        elif not board.free >> (move - 1) & 1:
+            print("that square is already taken")
+        else:
+            board.play(move, "O")
+            return move
+
+
+def make_list_of_free_fields(board):
+    return list(FREE_FIELDS[board.free])
+
+
+def victory_for(board, sign):
+    return WINNING[board.x if sign == "X" else board.o]
+
+
+# A random free square for X (the exercise asks for no more than that).
+def draw_move(board, rng=random):
+    free = FREE_SQUARES[board.free]
+    if not free:
+        return None
+    move = 5 if board.free >> 4 & 1 else rng.choice(free)
+    board.play(move, "X")
+    return move
+
+
+def play(read=input):
+    board = new_board()
+    while True:
+        display_board(board)
+        if not board.free:
+            print("It's a tie!")
+            return None
+        enter_move(board, read)
+        if victory_for(board, "O"):
+            display_board(board)
+            print("You won!")
+            return "O"
+        if not board.free:
+            display_board(board)
+            print("It's a tie!")
+            return None
+        draw_move(board)
+        if victory_for(board, "X"):
+            display_board(board)
+            print("The computer won!")
+            return "X"
+
+
+# ------------------------------------------------------------
+# Benchmark helpers: the list-of-lists versions
+# ------------------------------------------------------------
+
+LIST_LINES = (
+    [(0, 0), (0, 1), (0, 2)], [(1, 0), (1, 1), (1, 2)], [(2, 0), (2, 1), (2, 2)],
+    [(0, 0), (1, 0), (2, 0)], [(0, 1), (1, 1), (2, 1)], [(0, 2), (1, 2), (2, 2)],
+    [(0, 0), (1, 1), (2, 2)], [(0, 2), (1, 1), (2, 0)],
+)
+
+
+def _list_free_fields(rows):
+    return [(r, c) for r in range(3) for c in range(3) if rows[r][c] not in ("X", "O")]
+
+
+def _list_victory_for(rows, sign):
+    return any(all(rows[r][c] == sign for r, c in line) for line in LIST_LINES)
+
+
+# Random positions reached by random play (finished games included).
+def _random_boards(count, rng):
+    boards = []
+    for _ in range(count):
+        board = Board()
+        squares = list(range(1, 10))
+        rng.shuffle(squares)
+        for i, square in enumerate(squares[:rng.randrange(10)]):
+            board.play(square, "X" if i % 2 == 0 else "O")
+        boards.append(board)
+    return boards
+
+
+if __name__ == "__main__":
+    if sys.argv[1:] == ["play"]:
+        play()
+        sys.exit()
+
+    print("\n# -----------------------------")
+    print("# Board")
+    print("# -----------------------------\n")
+
+    board = Board.from_rows([["X", "O", "3"], ["4", "X", "O"], ["7", "8", "X"]])
+    display_board(board)
+    print(make_list_of_free_fields(board))             # [(0, 2), (1, 0), (2, 0), (2, 1)]
+    print(victory_for(board, "X"), victory_for(board, "O"))  # True False
+
+    print("\n# -----------------------------")
+    print("# Benchmark")
+    print("# -----------------------------\n")
+
+    boards = _random_boards(100_000, random.Random(10))
+    rows = [b.to_rows() for b in boards]
+
+    # same answers on every position
+    for b, r in zip(boards, rows):
+        assert make_list_of_free_fields(b) == _list_free_fields(r)
+        for sign in "XO":
+            assert victory_for(b, sign) == _list_victory_for(r, sign)
+
+    for name, func in (
+        ("list free fields", lambda: [_list_free_fields(r) for r in rows]),
+        ("bitboard free fields", lambda: [make_list_of_free_fields(b) for b in boards]),
+        ("list victory_for", lambda: [_list_victory_for(r, "X") for r in rows]),
+        ("bitboard victory_for", lambda: [victory_for(b, "X") for b in boards]),
+    ):
+        start = perf_counter()
+        func()
+        seconds = perf_counter() - start
+        print(f"{name:<22} {len(boards) / seconds / 1e6:8.2f} M calls/s")
+
+    print("\n# -----------------------------")
+    print("# Rendering benchmark")
+    print("# -----------------------------\n")
+
+    # imported here: exercise_010 prints when imported
+    from exercise_010_tic_tac_toe import display_board as display_board_prints  # run this file from the exercises folder
+
+    # same text as the exercise, for every board
+    for b, r in zip(boards[:2000], rows):
+        printed = io.StringIO()
+        with redirect_stdout(printed):
+            display_board_prints(r)
+        written = io.StringIO()
+        display_board(b, written)
+        assert printed.getvalue() == written.getvalue()
+
+    sample = boards[:20_000]
+    sample_rows = rows[:20_000]
+    for name, func in (
+        ("exercise (print calls)", lambda out: [display_board_prints(r) for r in sample_rows]),
+        ("cached, one write", lambda out: [display_board(b, out) for b in sample]),
+        ("cached, list of lists", lambda out: [display_board(r, out) for r in sample_rows]),
+    ):
+        out = io.StringIO()
+        start = perf_counter()
+        with redirect_stdout(out):
+            func(out)
+        seconds = perf_counter() - start
+        print(f"{name:<24} {len(sample) / seconds:>12,.0f} renders/s")
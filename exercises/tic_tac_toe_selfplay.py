@@ -0,0 +1,157 @@
+# ============================================================
+#      EXERCISE 010 (EXTRA) — MILLIONS OF GAMES (SELF-PLAY)
+# ============================================================
+# Companion to exercise_010_tic_tac_toe.py and tic_tac_toe_bitboard.py
+#
+# Problem:
+#   The exercise is built around input(), print() and one game at a
+#   time. To compare computer players we need millions of games and
+#   never want to draw a board.
+#
+# Idea:
+#   - A game is two ints (the bitboards from tic_tac_toe_bitboard.py)
+#     and a loop of table lookups: no Board objects, no printing.
+#   - A strategy is a function (me, opp, rng) -> square (1..9), where
+#     `me` and `opp` are the bitboards of the player to move and of the
+#     other player. New strategies are added to STRATEGIES by name.
+#   - Games are played in batches in a process pool. Every batch gets
+#     its own random.Random seeded from (seed, batch number), so the
+#     result is the same for any number of workers.
+#
+# Strategies:
+#   random     a random free square (what the exercise asks for)
+#   center     center, then a corner, then any square (random among equals)
+#   win_block  win if possible, else block the opponent, else random
+#   perfect    the negamax solver from tic_tac_toe_solver.py
+#
+# Run (from the exercises folder):
+#   python tic_tac_toe_selfplay.py [games]      (results + scaling report)
+# ============================================================
+
+import os
+import random
+import sys
+from collections import Counter
+from multiprocessing import Pool
+from time import perf_counter
+
+from tic_tac_toe_bitboard import FREE_SQUARES, FULL, WINNING  # run this file from the exercises folder
+
+BATCH_GAMES = 20_000
+CORNERS = (1, 3, 7, 9)
+
+
+def random_move(me, opp, rng):
+    return rng.choice(FREE_SQUARES[FULL ^ (me | opp)])
+
+
+def center_move(me, opp, rng):
+    free = FULL ^ (me | opp)
+    if free & 0b000_010_000:
+        return 5
+    corners = [s for s in CORNERS if free >> (s - 1) & 1]
+    return rng.choice(corners or FREE_SQUARES[free])
+
+
+def win_block_move(me, opp, rng):
+    free_squares = FREE_SQUARES[FULL ^ (me | opp)]
+    for s in free_squares:
+        if WINNING[me | 1 << (s - 1)]:
+            return s
+    for s in free_squares:
+        if WINNING[opp | 1 << (s - 1)]:
+            return s
+    return rng.choice(free_squares)
+
+
+_solver = None
+_perfect_moves = {}
+
+
+def perfect_move(me, opp, rng):
+    global _solver
+    move = _perfect_moves.get((me, opp))
+    if move is None:
+        if _solver is None:
+            from tic_tac_toe_solver import Solver  # run this file from the exercises folder
+            _solver = Solver(3, 3, 3)
+        move = _perfect_moves[me, opp] = _solver.best_move(me, opp) + 1
+    return move
+
+
+STRATEGIES = {
+    "random": random_move,
+    "center": center_move,
+    "win_block": win_block_move,
+    "perfect": perfect_move,
+}
+
+
+# One game, X moves first. Returns "X", "O" or "draw".
+def play_game(x_move, o_move, rng):
+    me, opp = 0, 0  # bitboards of the player to move and of the other one
+    moves = (x_move, o_move)
+    for turn in range(9):
+        square = moves[turn & 1](me, opp, rng)
+        me |= 1 << (square - 1)
+        if WINNING[me]:
+            return "X" if turn % 2 == 0 else "O"
+        me, opp = opp, me
+    return "draw"
+
+
+def _play_batch(args):
+    x_name, o_name, seed, batch, games = args
+    rng = random.Random(f"{seed}-{batch}")
+    x_move, o_move = STRATEGIES[x_name], STRATEGIES[o_name]
+    return Counter(play_game(x_move, o_move, rng) for _ in range(games))
+
+
+# Plays `games` games and returns a Counter of "X", "O" and "draw".
+def simulate(games, x="random", o="random", workers=1, seed=0, batch_games=BATCH_GAMES):
+    tasks = [
+        (x, o, seed, batch, min(batch_games, games - start))
+        for batch, start in enumerate(range(0, games, batch_games))
+    ]
+    totals = Counter()
+    if workers == 1:
+        for counts in map(_play_batch, tasks):
+            totals += counts
+        return totals
+    with Pool(workers) as pool:
+        for counts in pool.imap_unordered(_play_batch, tasks):
+            totals += counts
+    return totals
+
+
+if __name__ == "__main__":
+    games = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+
+    print("\n# -----------------------------")
+    print("# X against O (X moves first)")
+    print("# -----------------------------\n")
+
+    for x, o in (("random", "random"), ("center", "random"), ("win_block", "random"),
+                 ("win_block", "win_block"), ("perfect", "random"), ("random", "perfect"),
+                 ("perfect", "perfect")):
+        start = perf_counter()
+        counts = simulate(games, x, o)
+        seconds = perf_counter() - start
+        wins, losses, draws = counts["X"], counts["O"], counts["draw"]
+        print(f"{x:>9} vs {o:<9}  X {wins / games:6.1%}  O {losses / games:6.1%}  "
+              f"draw {draws / games:6.1%}  ({games / seconds:>9,.0f} games/s)")
+
+    print("\n# -----------------------------")
+    print("# Scaling (random vs random)")
+    print("# -----------------------------\n")
+
+    expected = simulate(games, workers=1)
+    base_rate = None
+    for workers in range(1, (os.cpu_count() or 1) + 1):
+        start = perf_counter()
+        counts = simulate(games, workers=workers)
+        seconds = perf_counter() - start
+        assert counts == expected  # same seeds per batch -> same games
+        rate = games / seconds
+        base_rate = base_rate or rate
+        print(f"workers {workers:>3}: {rate:>12,.0f} games/s  speedup {rate / base_rate:5.2f}x")
@@ -0,0 +1,217 @@
+# ============================================================
+#      EXERCISE 010 (EXTRA) — TIC-TAC-TOE SERVER (ASYNCIO)
+# ============================================================
+# Companion to exercise_010_tic_tac_toe.py and tic_tac_toe_bitboard.py
+#
+# Problem:
+#   The game loop sketched at the end of the exercise
+#   (display_board -> enter_move -> draw_move) serves one player at
+#   the keyboard. We want thousands of players at the same time.
+#
+# Idea:
+#   - An asyncio TCP server on localhost. Every connection is one
+#     coroutine that waits for a line instead of calling input(), so
+#     thousands of games cost thousands of small objects, not threads.
+#   - A game is a Board from tic_tac_toe_bitboard.py: two ints in an
+#     object with __slots__.
+#   - There are only 3**9 = 19683 boards, so the text of every board is
+#     rendered once at start-up; sending a board is a dict lookup.
+#
+# Protocol (one line per message):
+#   server -> client: the board, then a status line
+#     MOVE s     the computer played square s, your turn
+#     WIN        you (O) won
+#     LOSE s     the computer won with square s
+#     TIE [s]    the board is full (s: the computer's last square)
+#     ERROR ...  the line was not a free square 1..9 (no board sent)
+#   client -> server: a square number 1..9, "new" or "quit"
+#   As in the exercise, the computer is X and starts in the center.
+#
+# Run (from the exercises folder):
+#   python tic_tac_toe_server.py serve [--port 8765]    (then: nc localhost 8765)
+#   python tic_tac_toe_server.py bench [--sessions 1000 10000] [--games 3]
+# ============================================================
+
+import argparse
+import asyncio
+import multiprocessing
+import random
+import resource
+from time import perf_counter
+
+from tic_tac_toe_bitboard import Board, draw_move, new_board, render_board, victory_for  # run this file from the exercises folder
+
+DEFAULT_PORT = 8765
+STATUSES = (b"MOVE", b"WIN", b"LOSE", b"TIE", b"ERROR")
+
+
+# RENDERS[board.key] is the text of every possible board (X and O disjoint).
+RENDERS = {
+    x | o << 9: render_board(Board(x, o)).encode()
+    for x in range(512)
+    for o in range(512)
+    if not x & o
+}
+
+
+# ------------------------------------------------------------
+# Server
+# ------------------------------------------------------------
+
+async def handle_session(reader, writer):
+    board = new_board()
+    over = False
+    writer.write(RENDERS[board.key] + b"MOVE 5\n")
+    try:
+        while line := await reader.readline():
+            command = line.strip()
+            if command == b"quit":
+                break
+            if command == b"new":
+                board = new_board()
+                over = False
+                writer.write(RENDERS[board.key] + b"MOVE 5\n")
+            elif over:
+                writer.write(b"ERROR game over, send new or quit\n")
+            elif not (command.isdigit() and len(command) == 1 and command != b"0") \
+                    or not board.free >> (int(command) - 1) & 1:
+                writer.write(b"ERROR send a free square 1..9\n")
+            else:
+                board.play(int(command), "O")
+                if victory_for(board, "O"):
+                    status, over = b"WIN", True
+                elif not board.free:
+                    status, over = b"TIE", True
+                else:
+                    move = draw_move(board)
+                    if victory_for(board, "X"):
+                        status, over = b"LOSE %d" % move, True
+                    elif not board.free:
+                        status, over = b"TIE %d" % move, True
+                    else:
+                        status = b"MOVE %d" % move
+                writer.write(RENDERS[board.key] + status + b"\n")
+            await writer.drain()
+    except ConnectionError:
+        pass
+    finally:
+        writer.close()
+
+
+async def serve(host="127.0.0.1", port=DEFAULT_PORT, ready=None):
+    server = await asyncio.start_server(handle_session, host, port, backlog=4096)
+    if ready is not None:
+        ready.send(server.sockets[0].getsockname()[1])
+        ready.close()
+    async with server:
+        await server.serve_forever()
+
+
+# Use as many file descriptors as allowed: one per connection.
+def _raise_fd_limit():
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft < hard:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+    return hard
+
+
+def _serve_process(port, ready):
+    _raise_fd_limit()
+    asyncio.run(serve(port=port, ready=ready))
+
+
+# ------------------------------------------------------------
+# Load generator
+# ------------------------------------------------------------
+
+# Reads one response; returns its status line.
+async def _read_status(reader):
+    while True:
+        line = await reader.readline()
+        if not line:
+            raise ConnectionError("server closed the connection")
+        if line.startswith(STATUSES):
+            return line
+
+
+# One player: `games` games with random free squares; latency per move.
+async def _client_session(port, games, rng, latencies, start_gate):
+    await start_gate.wait()
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    status = await _read_status(reader)
+    for game in range(games):
+        if game:
+            writer.write(b"new\n")
+            status = await _read_status(reader)
+        free = set(range(1, 10)) - {5}
+        while status.startswith(b"MOVE"):
+            free.discard(int(status.split()[1]))
+            move = rng.choice(sorted(free))
+            free.discard(move)
+            start = perf_counter()
+            writer.write(b"%d\n" % move)
+            status = await _read_status(reader)
+            latencies.append(perf_counter() - start)
+    writer.write(b"quit\n")
+    await writer.drain()
+    writer.close()
+
+
+async def load_test(port, sessions, games, seed=0):
+    latencies = []
+    start_gate = asyncio.Event()
+    rng = random.Random(seed)
+    tasks = [
+        asyncio.create_task(_client_session(port, games, random.Random(rng.random()), latencies, start_gate))
+        for _ in range(sessions)
+    ]
+    start = perf_counter()
+    start_gate.set()
+    results = await asyncio.gather(*tasks, return_exceptions=True)
+    seconds = perf_counter() - start
+    errors = sum(isinstance(result, Exception) for result in results)
+    return latencies, seconds, errors
+
+
+def _percentile(sorted_values, fraction):
+    if not sorted_values:
+        return float("nan")
+    return sorted_values[min(len(sorted_values) - 1, int(fraction * len(sorted_values)))]
+
+
+def benchmark(session_counts, games):
+    limit = _raise_fd_limit()
+    parent, child = multiprocessing.Pipe()
+    server = multiprocessing.Process(target=_serve_process, args=(0, child), daemon=True)
+    server.start()
+    port = parent.recv()
+    try:
+        for sessions in session_counts:
+            if sessions + 16 > limit:
+                print(f"{sessions:>6} sessions: skipped, only {limit} file descriptors allowed")
+                continue
+            latencies, seconds, errors = asyncio.run(load_test(port, sessions, games))
+            latencies.sort()
+            print(f"{sessions:>6} sessions x {games} games: {len(latencies) / seconds:>9,.0f} moves/s  "
+                  f"p50 {_percentile(latencies, 0.50) * 1e3:7.2f} ms  "
+                  f"p99 {_percentile(latencies, 0.99) * 1e3:7.2f} ms  ({errors} failed sessions)")
+    finally:
+        server.terminate()
+        server.join()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Tic-tac-toe over TCP")
+    commands = parser.add_subparsers(dest="command", required=True)
+    serve_parser = commands.add_parser("serve", help="run the server")
+    serve_parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    bench_parser = commands.add_parser("bench", help="run a server and a load client")
+    bench_parser.add_argument("--sessions", type=int, nargs="+", default=[1000, 10000])
+    bench_parser.add_argument("--games", type=int, default=3)
+    args = parser.parse_args()
+
+    if args.command == "serve":
+        print(f"listening on 127.0.0.1:{args.port} ({len(RENDERS)} boards pre-rendered)")
+        asyncio.run(serve(port=args.port))
+    else:
+        benchmark(args.sessions, args.games)
@@ -0,0 +1,319 @@
+# ============================================================
+#      EXERCISE 010 (EXTRA) — PERFECT PLAY (NEGAMAX SOLVER)
+# ============================================================
+# Companion to exercise_010_tic_tac_toe.py and tic_tac_toe_bitboard.py
+#
+# Problem:
+#   The exercise's computer plays a random free square. To play
+#   perfectly it has to look at every way the game can continue —
+#   which gets expensive fast on boards bigger than 3 x 3.
+#
+# Idea 1 — negamax with alpha-beta:
+#   A position's value for the player to move is minus the best value
+#   of the positions after their move (the opponent moves next).
+#   A win is worth the number of free squares just before the winning
+#   move (so at least 1), a loss minus that, a draw 0: quicker wins
+#   score higher. Alpha-beta stops looking at a move as soon as it
+#   cannot change the result.
+#
+# Idea 2 — transposition table + symmetry:
+#   The same position is reached by many move orders, and a rotated
+#   or mirrored position has the same value. Every position is first
+#   turned into a canonical form (the smallest of its 8 symmetries on
+#   a square board, 4 on a rectangle) and its value is stored in a
+#   dict under that key.
+#
+# Idea 3 — cheap cut-offs before any search:
+#   - if the opponent threatens to win, blocking is the only move;
+#     two threats at once cannot both be blocked (a loss)
+#   - a player with no line left free of the other's marks cannot
+#     win, and when neither can, the game is a draw
+#
+# Generalized to m x n boards where k in a row wins ("m,n,k-games").
+# Boards are bitboards like in tic_tac_toe_bitboard.py: square
+# r * cols + c is bit r * cols + c, one int per player.
+#
+# Run (from the exercises folder):
+#   python tic_tac_toe_solver.py              (report up to 5x5,k=4: a few minutes)
+#   python tic_tac_toe_solver.py 4 5 4        (any rows cols k)
+# ============================================================
+
+import sys
+from time import perf_counter
+
+from tic_tac_toe_bitboard import FREE_SQUARES  # run this file from the exercises folder
+
+EXACT, LOWER, UPPER = 0, 1, 2
+
+
+# All k-in-a-row masks on a rows x cols board.
+def line_masks(rows, cols, k):
+    masks = []
+    for r in range(rows):
+        for c in range(cols):
+            for dr, dc in ((0, 1), (1, 0), (1, 1), (1, -1)):
+                end_r, end_c = r + dr * (k - 1), c + dc * (k - 1)
+                if 0 <= end_r < rows and 0 <= end_c < cols:
+                    masks.append(sum(1 << ((r + dr * i) * cols + c + dc * i) for i in range(k)))
+    return masks
+
+
+# The board symmetries as lists: square -> square it is moved to.
+def symmetries(rows, cols):
+    maps = [
+        lambda r, c: (r, c),
+        lambda r, c: (r, cols - 1 - c),
+        lambda r, c: (rows - 1 - r, c),
+        lambda r, c: (rows - 1 - r, cols - 1 - c),
+    ]
+    if rows == cols:
+        maps += [
+            lambda r, c: (c, r),
+            lambda r, c: (c, rows - 1 - r),
+            lambda r, c: (rows - 1 - c, r),
+            lambda r, c: (rows - 1 - c, rows - 1 - r),
+        ]
+    perms = []
+    for move in maps:
+        perm = []
+        for square in range(rows * cols):
+            r, c = move(*divmod(square, cols))
+            perm.append(r * cols + c)
+        perms.append(perm)
+    return perms
+
+
+# For every symmetry: one 256-entry table per byte of the board, so a
+# whole board is permuted with one lookup per byte instead of per square.
+def _byte_tables(perm):
+    tables = []
+    for first in range(0, len(perm), 8):
+        table = []
+        for byte in range(256):
+            bits = 0
+            for i in range(8):
+                if byte >> i & 1 and first + i < len(perm):
+                    bits |= 1 << perm[first + i]
+            table.append(bits)
+        tables.append(table)
+    return tables
+
+
+class Solver:
+    def __init__(self, rows=3, cols=3, k=3):
+        self.rows, self.cols, self.k = rows, cols, k
+        self.size = rows * cols
+        self.full = (1 << self.size) - 1
+        self.masks = masks = line_masks(rows, cols, k)
+        self.masks_through = [[m for m in masks if m >> s & 1] for s in range(self.size)]
+
+        # squares on many lines first: good moves early = more cut-offs
+        self.order = sorted(range(self.size), key=lambda s: -len(self.masks_through[s]))
+        self.sym_tables = [_byte_tables(perm) for perm in symmetries(rows, cols)]
+
+        self.table = {}
+        self.nodes = 0
+        self.probes = 0
+        self.hits = 0
+
+    @property
+    def hit_rate(self):
+        return self.hits / self.probes if self.probes else 0.0
+
+    def canonical(self, me, opp):
+        shift = self.size
+        best = None
+        for tables in self.sym_tables:
+            pm = po = 0
+            m, o = me, opp
+            for table in tables:
+                pm |= table[m & 255]
+                po |= table[o & 255]
+                m >>= 8
+                o >>= 8
+            key = pm | po << shift
+            if best is None or key < best:
+                best = key
+        return best
+
+    def wins(self, bits, square):
+        for mask in self.masks_through[square]:
+            if bits & mask == mask:
+                return True
+        return False
+
+    def has_open_line(self, me, opp):
+        for mask in self.masks:
+            if not mask & opp:
+                return True
+        return False
+
+    # Value of the position for the player to move (`me`).
+    def negamax(self, me, opp, alpha, beta):
+        self.nodes += 1
+        free = self.full ^ (me | opp)
+        if not free:
+            return 0
+        empty = free.bit_count()
+
+        threats = 0
+        for s in self.order:
+            if free >> s & 1:
+                if self.wins(me | 1 << s, s):
+                    return empty  # win right now: the best this position can give
+                if self.wins(opp | 1 << s, s):
+                    threats |= 1 << s
+        if threats:
+            if threats & (threats - 1):
+                return 1 - empty  # two threats: only one can be blocked
+            free = threats  # one threat: blocking it is the only move
+
+        # no win right now, so the best left is a win two moves later (or a draw)
+        most = max(empty - 2, 0)
+        # a player whose every line is blocked by the other cannot win
+        if not self.has_open_line(me, opp):
+            most = 0
+        if not self.has_open_line(opp, me):
+            if most == 0:
+                return 0  # nobody can win any more
+            if alpha < 0:
+                alpha = 0
+        if beta > most:
+            beta = most
+        if alpha >= beta:
+            return beta
+
+        key = self.canonical(me, opp)
+        self.probes += 1
+        entry = self.table.get(key)
+        if entry is not None:
+            self.hits += 1
+            flag, value = entry
+            if flag == EXACT:
+                return value
+            if flag == LOWER and value >= beta:
+                return value
+            if flag == UPPER and value <= alpha:
+                return value
+
+        original_alpha = alpha
+        best = -self.size - 1
+        for s in self.order:
+            if not free >> s & 1:
+                continue
+            value = -self.negamax(opp, me | 1 << s, -beta, -alpha)
+            if value > best:
+                best = value
+                if value > alpha:
+                    alpha = value
+                    if alpha >= beta:
+                        break
+
+        if best <= original_alpha:
+            self.table[key] = (UPPER, best)
+        elif best >= beta:
+            self.table[key] = (LOWER, best)
+        else:
+            self.table[key] = (EXACT, best)
+        return best
+
+    # Exact value (exact=True) or only its sign: win > 0, draw 0, loss < 0.
+    # The sign needs just the window (-1, 1), which cuts off far more.
+    def solve(self, me=0, opp=0, exact=False):
+        bound = self.size + 1 if exact else 1
+        return self.negamax(me, opp, -bound, bound)
+
+    # Best square (0-based) for the player to move, or None on a full board.
+    def best_move(self, me, opp):
+        free = self.full ^ (me | opp)
+        best_square, best_value = None, None
+        bound = self.size + 1
+        for s in self.order:
+            if not free >> s & 1:
+                continue
+            if self.wins(me | 1 << s, s):
+                return s
+            value = -self.negamax(opp, me | 1 << s, -bound, bound)
+            if best_value is None or value > best_value:
+                best_square, best_value = s, value
+        return best_square
+
+
+# ------------------------------------------------------------
+# Perfect computer player for the exercise
+# ------------------------------------------------------------
+
+_solver_3x3 = None
+
+
+# Like draw_move() in tic_tac_toe_bitboard.py, but never loses.
+def draw_move(board):
+    global _solver_3x3
+    if not FREE_SQUARES[board.free]:
+        return None
+    if board.x == board.o == 0:
+        move = 5  # the computer always starts in the center
+    else:
+        if _solver_3x3 is None:
+            _solver_3x3 = Solver(3, 3, 3)
+        move = _solver_3x3.best_move(board.x, board.o) + 1
+    board.play(move, "X")
+    return move
+
+
+def _result(value):
+    if value > 0:
+        return "first player wins"
+    if value < 0:
+        return "second player wins"
+    return "draw"
+
+
+def report(rows, cols, k):
+    solver = Solver(rows, cols, k)
+    start = perf_counter()
+    value = solver.solve()
+    seconds = perf_counter() - start
+    print(f"{rows}x{cols}, k={k}: {_result(value):<18} nodes {solver.nodes:>12,}  "
+          f"table {len(solver.table):>10,}  hit rate {solver.hit_rate:6.1%}  {seconds:8.2f} s")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 4:
+        report(*map(int, sys.argv[1:]))
+        sys.exit()
+
+    print("\n# -----------------------------")
+    print("# Perfect play on the exercise board")
+    print("# -----------------------------\n")
+
+    import random
+
+    from tic_tac_toe_bitboard import new_board, victory_for  # run this file from the exercises folder
+
+    # perfect X against random O: X may win or draw, but never lose
+    rng = random.Random(10)
+    results = {"X": 0, "O": 0, "draw": 0}
+    for _ in range(1000):
+        board = new_board()
+        while True:
+            board.play(rng.choice(FREE_SQUARES[board.free]), "O")
+            if victory_for(board, "O"):
+                results["O"] += 1
+                break
+            draw_move(board)
+            if victory_for(board, "X"):
+                results["X"] += 1
+                break
+            if not board.free:
+                results["draw"] += 1
+                break
+    print("1000 games, perfect X vs random O:", results)
+    assert results["O"] == 0
+
+    print("\n# -----------------------------")
+    print("# Solving from the empty board")
+    print("# -----------------------------\n")
+
+    for rows, cols, k in ((3, 3, 3), (4, 4, 3), (4, 4, 4), (4, 5, 4), (5, 5, 4)):
+        report(rows, cols, k)
@@ -0,0 +1,195 @@
+# ============================================================
+#      EXERCISE 009 (EXTRA) — MANY TRIANGLES, STABLE HERON
+# ============================================================
+# Companion to exercise_009_triangle_area.py
+#
+# Problem:
+#   triangle_area(a, b, c) handles one triangle per call and goes
+#   through three helper functions. For 10**7 triangles the calls
+#   alone dominate. The textbook formula
+#       s = (a + b + c) / 2,   A = sqrt(s(s - a)(s - b)(s - c))
+#   also loses precision for needle-like triangles: s - a subtracts
+#   two almost equal numbers and the rounding error of s is left over.
+#
+# Idea 1 — the stable form (W. Kahan):
+#   Sort the sides so that a >= b >= c, then
+#       A = 1/4 * sqrt((a + (b + c)) * (c - (a - b)) * (c + (a - b)) * (a + (b - c)))
+#   The brackets matter: every subtraction is either exact or only
+#   subtracts numbers whose difference is already exact.
+#
+# Idea 2 — columns instead of calls:
+#   triangle_areas(a, b, c) takes whole columns (lists, arrays or
+#   NumPy arrays). With NumPy the sides are sorted with 6 min/max
+#   operations (a sorting network), validity is one boolean mask, and
+#   invalid rows get NaN instead of None. Without NumPy the rows are
+#   handled one by one: not faster than the exercise, but stable.
+#
+#   A row is valid like in the exercise: every side is shorter than
+#   the sum of the other two (so also: all sides > 0).
+#
+# Run (from the exercises folder):
+#   python triangle_areas.py [count]   (accuracy + benchmark)
+# ============================================================
+
+import math
+import random
+import sys
+from array import array
+from decimal import Decimal, localcontext
+from fractions import Fraction
+from time import perf_counter
+
+try:
+    import numpy as np  # optional: vectorized version
+except ImportError:
+    np = None
+
+
+# Area of one triangle with the stable formula, NaN if it is not valid.
+def stable_area(a, b, c):
+    # three compare-and-swaps are cheaper than sorted() for 3 values
+    if a < b:
+        a, b = b, a
+    if b < c:
+        b, c = c, b
+        if a < b:
+            a, b = b, a
+    if not (c > 0 and b + c > a):  # also False for NaN sides
+        return math.nan
+    d = a - b
+    product = (a + (b + c)) * (c - d) * (c + d) * (a + (b - c))
+    return 0.25 * math.sqrt(product) if product > 0 else 0.0
+
+
+def _np_areas(a, b, c):
+    a, b, c = (np.asarray(x, dtype=np.float64) for x in (a, b, c))
+    # sorting network: afterwards a >= b >= c in every row
+    low, high = np.minimum(a, b), np.maximum(a, b)
+    a = np.maximum(high, c)
+    middle = np.minimum(high, c)
+    b = np.maximum(low, middle)
+    c = np.minimum(low, middle)
+
+    valid = (c > 0) & (b + c > a)
+    a_minus_b = a - b
+    product = (a + (b + c)) * (c - a_minus_b) * (c + a_minus_b) * (a + (b - c))
+    np.maximum(product, 0.0, out=product)  # rounding can make a valid needle slightly negative
+    areas = np.sqrt(product)
+    areas *= 0.25
+    areas[~valid] = np.nan
+    return areas
+
+
+# Areas of many triangles; invalid rows give NaN.
+# NumPy arrays in -> NumPy array out, otherwise array('d').
+def triangle_areas(a, b, c):
+    if np is not None and any(isinstance(x, np.ndarray) for x in (a, b, c)):
+        return _np_areas(a, b, c)
+    return array("d", map(stable_area, a, b, c))
+
+
+# ------------------------------------------------------------
+# Exact reference
+# ------------------------------------------------------------
+
+# 16 * A**2 = (a+b+c)(-a+b+c)(a-b+c)(a+b-c) computed exactly with
+# Fraction (every float is an exact fraction), then one square root
+# with 50 significant digits.
+def reference_area(a, b, c):
+    a, b, c = Fraction(a), Fraction(b), Fraction(c)
+    sixteen_area_sq = (a + b + c) * (-a + b + c) * (a - b + c) * (a + b - c)
+    if sixteen_area_sq <= 0:
+        return 0.0
+    with localcontext() as ctx:
+        ctx.prec = 50
+        value = Decimal(sixteen_area_sq.numerator) / Decimal(sixteen_area_sq.denominator)
+        return float(value.sqrt() / 4)
+
+
+def _relative_error(value, exact):
+    return abs(value - exact) / exact if exact else abs(value)
+
+
+# ------------------------------------------------------------
+# Benchmark helpers
+# ------------------------------------------------------------
+
+# Random valid triangles: pick two sides, the third from the allowed range.
+def _random_triangles(count, rng):
+    sides = []
+    for _ in range(count):
+        a = rng.uniform(0.1, 10.0)
+        b = rng.uniform(0.1, 10.0)
+        c = rng.uniform(abs(a - b), a + b)
+        sides.append((a, b, c))
+    return sides
+
+
+# Needles: two long sides and one very short side.
+def _needles(count, rng):
+    sides = []
+    for _ in range(count):
+        long_side = rng.uniform(1.0, 1000.0)
+        short_side = long_side * 10.0 ** rng.uniform(-12, -4)
+        sides.append((long_side, long_side * (1 + rng.uniform(-1e-9, 1e-9)), short_side))
+    return sides
+
+
+if __name__ == "__main__":
+    # imported here: exercise_009 prints its examples when imported
+    from exercise_009_triangle_area import triangle_area  # run this file from the exercises folder
+
+    print("\n# -----------------------------")
+    print("# Examples")
+    print("# -----------------------------\n")
+
+    print(list(triangle_areas([3.0, 1.0, 2.0], [4.0, 1.0, 2.0], [5.0, 3.0, 3.0])))  # [6.0, nan, 1.984...]
+    if np is not None:
+        print(triangle_areas(np.array([3.0, 0.0]), np.array([4.0, 1.0]), np.array([5.0, 1.0])))  # [6. nan]
+
+    print("\n# -----------------------------")
+    print("# Accuracy (relative error vs exact reference)")
+    print("# -----------------------------\n")
+
+    rng = random.Random(9)
+    for label, sides in (("random triangles", _random_triangles(20_000, rng)),
+                         ("needle triangles", _needles(20_000, rng))):
+        exact = [reference_area(*t) for t in sides]
+        textbook = max(_relative_error(triangle_area(*t) or 0.0, e) for t, e in zip(sides, exact))
+        stable = max(_relative_error(stable_area(*t), e) for t, e in zip(sides, exact))
+        print(f"{label:<18} textbook max error {textbook:9.2e}   stable max error {stable:9.2e}")
+
+    print("\n# -----------------------------")
+    print("# Benchmark")
+    print("# -----------------------------\n")
+
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000_000
+    if np is not None:
+        np_rng = np.random.default_rng(9)
+        a = np_rng.uniform(0.1, 10.0, count)
+        b = np_rng.uniform(0.1, 10.0, count)
+        c = np_rng.uniform(0.0, 20.0, count)  # about half of the rows are invalid
+        a_list, b_list, c_list = a.tolist(), b.tolist(), c.tolist()
+    else:
+        a_list = [rng.uniform(0.1, 10.0) for _ in range(count)]
+        b_list = [rng.uniform(0.1, 10.0) for _ in range(count)]
+        c_list = [rng.uniform(0.0, 20.0) for _ in range(count)]
+
+    start = perf_counter()
+    per_call = list(map(triangle_area, a_list, b_list, c_list))
+    seconds = perf_counter() - start
+    print(f"{'triangle_area per call':<26} {count / seconds / 1e6:8.2f} M triangles/s")
+
+    start = perf_counter()
+    column = triangle_areas(a_list, b_list, c_list)
+    seconds = perf_counter() - start
+    print(f"{'triangle_areas (lists)':<26} {count / seconds / 1e6:8.2f} M triangles/s")
+    assert [x is None for x in per_call] == [math.isnan(x) for x in column]
+
+    if np is not None:
+        start = perf_counter()
+        areas = triangle_areas(a, b, c)
+        seconds = perf_counter() - start
+        print(f"{'triangle_areas (numpy)':<26} {count / seconds / 1e6:8.2f} M triangles/s"
+              f"  ({int(np.isnan(areas).sum()):,} invalid rows)")
+        assert np.array_equal(np.isnan(areas), np.isnan(np.frombuffer(column, dtype=np.float64)))
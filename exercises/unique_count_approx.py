@@ -0,0 +1,219 @@
+# ============================================================
+#   EXERCISE 003 (EXTRA) — COUNTING UNIQUE ELEMENTS (HYPERLOGLOG)
+# ============================================================
+# Companion to exercise_003_unique_elements.py
+#
+# Problem:
+#   Sometimes we only need HOW MANY unique elements a stream has,
+#   not the elements themselves. len(set(data)) stores every value,
+#   so memory grows with the number of unique elements.
+#
+# Idea (HyperLogLog):
+#   - Hash every item to 64 random-looking bits.
+#   - The first `precision` bits pick one of m = 2**precision registers.
+#   - The rest of the bits: count the leading zeros + 1 (the "rank").
+#     A rank of r happens with probability 1 / 2**r, so seeing a high
+#     rank means many different items went into that register.
+#   - Each register keeps the highest rank it saw (one byte each).
+#   - A harmonic mean over all registers gives the estimate.
+#     Typical error is about 1.04 / sqrt(m): 0.8% for precision=14,
+#     using 16 KB no matter how long the stream is.
+#
+# Merging:
+#   Two sketches with the same precision merge by taking the maximum
+#   of each register. So shards can be counted in separate processes
+#   and combined afterwards. For this the hash must be the same in
+#   every process, so we do not use hash() (str hashes are randomized
+#   per process). Items go through hash64() from unique_stream.py:
+#   splitmix64 for ints, blake2b for everything else, with the same
+#   notion of "equal" as set() (1 == 1.0 == True, but "a" != b"a").
+#
+# Run:
+#   python unique_count_approx.py [max_power]   (demo + benchmark)
+# ============================================================
+
+import sys
+from math import log
+from multiprocessing import Pool
+from time import perf_counter
+
+from unique_stream import hash64  # run this file from the exercises folder
+
+try:
+    import numpy as np  # optional: fast path for integer arrays
+except ImportError:
+    np = None
+
+
+class HyperLogLog:
+    def __init__(self, precision=14):
+        if not 4 <= precision <= 18:
+            raise ValueError("precision must be between 4 and 18")
+        self.precision = precision
+        self.m = 1 << precision
+        self.registers = bytearray(self.m)
+
+    def add(self, item):
+        h = hash64(item)
+        p = self.precision
+        index = h >> (64 - p)
+        rest = h & ((1 << (64 - p)) - 1)
+        rank = (64 - p) - rest.bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def update(self, iterable):
+        if np is not None and isinstance(iterable, np.ndarray) and iterable.dtype.kind in "iu":
+            self._update_numpy(iterable)
+            return
+
+        # same as add(), inlined: this loop is the hot path
+        registers = self.registers
+        p = self.precision
+        shift = 64 - p
+        rest_mask = (1 << shift) - 1
+        for item in iterable:
+            h = hash64(item)
+            index = h >> shift
+            rank = shift - (h & rest_mask).bit_length() + 1
+            if rank > registers[index]:
+                registers[index] = rank
+
+    # Vectorized splitmix64 + rank; gives the same registers as add().
+    # hash64() uses splitmix64 only for ints in the int64 range, so
+    # bigger uint64 values take the Python loop.
+    def _update_numpy(self, values):
+        values = values.ravel()
+        if values.dtype == np.uint64:
+            big = values >> np.uint64(63) != 0
+            if big.any():
+                self.update(values[big].tolist())
+                values = values[~big]
+        z = values.astype(np.uint64, copy=True)
+        with np.errstate(over="ignore"):
+            z += np.uint64(0x9E3779B97F4A7C15)
+            z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+            z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+        z ^= z >> np.uint64(31)
+
+        shift = 64 - self.precision
+        index = (z >> np.uint64(shift)).astype(np.intp)
+        rest = z & np.uint64((1 << shift) - 1)
+
+        # exact bit_length by binary search over shifts
+        bit_length = np.zeros(len(rest), dtype=np.int64)
+        for step in (32, 16, 8, 4, 2, 1):
+            high = rest >> np.uint64(step)
+            has_high = high != 0
+            bit_length += step * has_high
+            rest = np.where(has_high, high, rest)
+        bit_length += rest != 0
+
+        rank = (shift - bit_length + 1).astype(np.uint8)
+        registers = np.frombuffer(self.registers, dtype=np.uint8)
+        np.maximum.at(registers, index, rank)
+
+    def merge(self, other):
+        if other.precision != self.precision:
+            raise ValueError("cannot merge sketches with different precision")
+        self.registers = bytearray(map(max, self.registers, other.registers))
+        return self
+
+    def count(self):
+        m = self.m
+        if m == 16:
+            alpha = 0.673
+        elif m == 32:
+            alpha = 0.697
+        elif m == 64:
+            alpha = 0.709
+        else:
+            alpha = 0.7213 / (1 + 1.079 / m)
+
+        estimate = alpha * m * m / sum(2.0 ** -r for r in self.registers)
+
+        # small range: many registers still empty -> linear counting is better
+        zeros = self.registers.count(0)
+        if estimate <= 2.5 * m and zeros:
+            estimate = m * log(m / zeros)
+        return round(estimate)
+
+    def __len__(self):
+        return self.count()
+
+
+def approx_unique_count(iterable, precision=14):
+    sketch = HyperLogLog(precision)
+    sketch.update(iterable)
+    return sketch.count()
+
+
+# ------------------------------------------------------------
+# Parallel shards: one sketch per process, merged at the end
+# ------------------------------------------------------------
+
+def _sketch_range(args):
+    lo, hi, precision = args
+    sketch = HyperLogLog(precision)
+    sketch.update(range(lo, hi))
+    return sketch
+
+
+def approx_unique_count_ranges(ranges, precision=14, workers=None):
+    with Pool(workers) as pool:
+        sketches = pool.map(_sketch_range, [(lo, hi, precision) for lo, hi in ranges])
+    total = sketches[0]
+    for sketch in sketches[1:]:
+        total.merge(sketch)
+    return total.count()
+
+
+if __name__ == "__main__":
+    numbers = [8, 1, 8, 6, 3, 9, 3, 2, 11, 6]
+
+    print("\n# -----------------------------")
+    print("# Exercise data")
+    print("# -----------------------------\n")
+
+    print("exact: ", len(set(numbers)))                # 7
+    print("approx:", approx_unique_count(numbers))     # 7
+
+    mixed = [1, 1.0, True, "a", b"a", 2.0, 2]
+    print("mixed: ", len(set(mixed)), approx_unique_count(mixed))  # 4 4
+
+    print("\n# -----------------------------")
+    print("# Merged shards (overlapping ranges)")
+    print("# -----------------------------\n")
+
+    shards = [(0, 300_000), (200_000, 500_000), (400_000, 700_000)]
+    print("exact:  700000")
+    print("approx:", approx_unique_count_ranges(shards))
+
+    print("\n# -----------------------------")
+    print("# Benchmark: error and speed vs len(set(...))")
+    print("# -----------------------------\n")
+
+    max_power = int(sys.argv[1]) if len(sys.argv) > 1 else 6
+    for power in range(5, max_power + 1):
+        n = 10 ** power
+        data = [i % (n // 2) * 7919 for i in range(n)]
+
+        start = perf_counter()
+        exact = len(set(data))
+        set_seconds = perf_counter() - start
+
+        start = perf_counter()
+        approx = approx_unique_count(data)
+        hll_seconds = perf_counter() - start
+
+        line = (f"n={n:>11,}  set {n / set_seconds:>12,.0f}/s  "
+                f"hll {n / hll_seconds:>10,.0f}/s  error {abs(approx - exact) / exact:6.2%}")
+
+        if np is not None:
+            array_data = np.array(data, dtype=np.int64)
+            start = perf_counter()
+            approx_np = approx_unique_count(array_data)
+            np_seconds = perf_counter() - start
+            assert approx_np == approx
+            line += f"  hll numpy {n / np_seconds:>12,.0f}/s"
+        print(line)
@@ -0,0 +1,284 @@
+# ============================================================
+#      EXERCISE 003 (EXTRA) — UNIQUE LINES OF A HUGE FILE
+# ============================================================
+# Companion to exercise_003_unique_elements.py and unique_stream.py
+#
+# Problem:
+#   Keep the first copy of every line of a text file, in the original
+#   order, when the file is bigger than RAM. A set of all lines
+#   (like dict.fromkeys in the exercise) does not fit.
+#
+# Idea (external memory, three passes):
+#   1) Partition: read the file once. Each line goes to one of B
+#      temporary bucket files, chosen by a hash of the line, together
+#      with its byte offset in the input. Equal lines always land in
+#      the same bucket, so buckets can be deduplicated independently.
+#      Lines that repeat a recent line (a small set, cleared when it
+#      reaches its share of the budget) are dropped right here.
+#   2) Dedup: stream one bucket at a time and keep only the first
+#      offset of every line. Only the set of distinct lines of that
+#      bucket is in memory, so a line repeated a million times (all
+#      copies land in the same bucket) costs no more than once.
+#      Kept lines are written back sorted by offset.
+#   3) Merge: heapq.merge() reads the B sorted bucket files side by
+#      side and writes lines in offset order = original order.
+#
+#   B is chosen from the file size and the --mem budget. If the whole
+#   file fits in the budget, the lines are deduplicated in memory.
+#   Passes 1 and 3 keep all B bucket files open at once, so B is also
+#   capped by the open-file limit (ulimit -n) minus some headroom.
+#   During passes 1 and 3 half of --mem goes to the B file buffers
+#   and (pass 1) a quarter to the set of recent lines.
+#
+#   Lines are compared without their trailing newline, and every
+#   output line ends with "\n".
+#
+# Run (from the repository root):
+#   python -m exercises.unique_external in.txt out.txt --mem 256M
+#   python -m exercises.unique_external --bench 200M
+# ============================================================
+
+import argparse
+import heapq
+import io
+import os
+import random
+import struct
+import sys
+import tempfile
+import tracemalloc
+import zlib
+from time import perf_counter
+
+try:
+    import resource  # Unix only: the open-file limit
+except ImportError:
+    resource = None
+
+# (offset, length) in front of every line in the bucket files
+RECORD = struct.Struct("<QI")
+
+# Python needs several bytes of memory per byte of text it holds
+# (object headers, dict slots), so a bucket may be this much smaller
+# than the memory budget.
+MEMORY_OVERHEAD = 4
+
+BUFFER_SIZE = 1 << 20
+BUCKET_BUFFER_SIZE = BUFFER_SIZE // 16
+
+# rough memory cost of one line in a set, on top of its text
+SET_ITEM_BYTES = 100
+
+# file descriptors left for stdin/stdout/stderr, the input, the output
+# and whatever else the process has open
+FD_HEADROOM = 32
+
+
+def parse_size(text):
+    units = {"K": 1 << 10, "M": 1 << 20, "G": 1 << 30, "T": 1 << 40}
+    text = text.strip().upper().rstrip("B")
+    if text and text[-1] in units:
+        return int(float(text[:-1]) * units[text[-1]])
+    return int(text)
+
+
+def _lines(path, buffer=BUFFER_SIZE):
+    with open(path, "rb", buffering=buffer) as f:
+        offset = 0
+        for line in f:
+            yield offset, line.rstrip(b"\n")
+            offset += len(line)
+
+
+# Most buckets that can be open at the same time.
+def max_buckets():
+    if resource is None:
+        return 512 - FD_HEADROOM  # the C runtime's default limit on Windows
+    soft, _ = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft == resource.RLIM_INFINITY:
+        soft = 1 << 16
+    return max(2, soft - FD_HEADROOM)
+
+
+# Buffer per open bucket file: all of them together fit in half the budget.
+def _bucket_buffer(mem, num_buckets):
+    return max(io.DEFAULT_BUFFER_SIZE, min(BUCKET_BUFFER_SIZE, mem // 2 // num_buckets))
+
+
+# ------------------------------------------------------------
+# Small files — everything in memory
+# ------------------------------------------------------------
+
+def _dedup_in_memory(in_path, out_path):
+    seen = set()
+    kept = 0
+    with open(out_path, "wb", buffering=BUFFER_SIZE) as out:
+        for _, line in _lines(in_path):
+            if line not in seen:
+                seen.add(line)
+                out.write(line + b"\n")
+                kept += 1
+    return kept
+
+
+# ------------------------------------------------------------
+# Big files — partition, dedup buckets, merge
+# ------------------------------------------------------------
+
+def _partition(in_path, tmp_dir, num_buckets, buffer, recent_budget, io_buffer):
+    paths = [os.path.join(tmp_dir, f"bucket_{i:05d}.bin") for i in range(num_buckets)]
+    files = []
+    try:
+        for p in paths:
+            files.append(open(p, "wb", buffering=buffer))
+        pack = RECORD.pack
+        recent = set()
+        recent_bytes = 0
+        for offset, line in _lines(in_path, io_buffer):
+            if line in recent:
+                continue  # an earlier copy is already in its bucket
+            if recent_bytes > recent_budget:
+                recent.clear()
+                recent_bytes = 0
+            recent.add(line)
+            recent_bytes += len(line) + SET_ITEM_BYTES
+            f = files[zlib.crc32(line) % num_buckets]
+            f.write(pack(offset, len(line)))
+            f.write(line)
+    finally:
+        for f in files:
+            f.close()
+    return paths
+
+
+def _stream_records(path, buffer):
+    header = RECORD.size
+    with open(path, "rb", buffering=buffer) as f:
+        while True:
+            head = f.read(header)
+            if not head:
+                return
+            offset, length = RECORD.unpack(head)
+            yield offset, f.read(length)
+
+
+# Records inside a bucket are already in offset order, so the first
+# time we meet a line is its first occurrence in the whole file.
+def _dedup_bucket(path, buffer):
+    seen = set()
+    kept = 0
+    out_path = path + ".uniq"
+    pack = RECORD.pack
+    with open(out_path, "wb", buffering=buffer) as out:
+        for offset, line in _stream_records(path, buffer):
+            if line not in seen:
+                seen.add(line)
+                out.write(pack(offset, len(line)))
+                out.write(line)
+                kept += 1
+    os.remove(path)
+    return out_path, kept
+
+
+def _merge(bucket_paths, out_path, buffer, io_buffer):
+    streams = [_stream_records(p, buffer) for p in bucket_paths]
+    with open(out_path, "wb", buffering=io_buffer) as out:
+        for _, line in heapq.merge(*streams):
+            out.write(line + b"\n")
+
+
+def dedup_file(in_path, out_path, mem=256 << 20, tmp_dir=None):
+    size = os.path.getsize(in_path)
+    num_buckets = -(-size * MEMORY_OVERHEAD // mem)  # ceiling division
+
+    if num_buckets <= 1:
+        return {"buckets": 0, "lines_kept": _dedup_in_memory(in_path, out_path)}
+
+    # too many open files otherwise; buckets just get bigger than the budget
+    num_buckets = min(num_buckets, max_buckets())
+    buffer = _bucket_buffer(mem, num_buckets)
+    io_buffer = max(io.DEFAULT_BUFFER_SIZE, min(BUFFER_SIZE, mem // 8))  # input, output, one bucket
+
+    with tempfile.TemporaryDirectory(dir=tmp_dir) as work_dir:
+        buckets = _partition(in_path, work_dir, num_buckets, buffer, mem // 4, io_buffer)
+        kept = 0
+        sorted_buckets = []
+        for path in buckets:
+            sorted_path, bucket_kept = _dedup_bucket(path, io_buffer)
+            sorted_buckets.append(sorted_path)
+            kept += bucket_kept
+        _merge(sorted_buckets, out_path, buffer, io_buffer)
+
+    return {"buckets": num_buckets, "lines_kept": kept}
+
+
+# ------------------------------------------------------------
+# Benchmark
+# ------------------------------------------------------------
+
+# `skew`: fraction of lines that are one and the same line.
+def _make_sample(path, size, distinct=200_000, skew=0.0):
+    rng = random.Random(42)
+    words = [f"line-{rng.getrandbits(48):012x}-{i}".encode() for i in range(distinct)]
+    common = b"the same line, over and over"
+    written = 0
+    with open(path, "wb", buffering=BUFFER_SIZE) as f:
+        while written < size:
+            lines = [common if rng.random() < skew else word for word in rng.choices(words, k=10_000)]
+            chunk = b"\n".join(lines) + b"\n"
+            f.write(chunk)
+            written += len(chunk)
+    return written
+
+
+def benchmark(size):
+    with tempfile.TemporaryDirectory() as tmp:
+        in_path = os.path.join(tmp, "in.txt")
+        out_path = os.path.join(tmp, "out.txt")
+        for skew in (0.0, 0.9):
+            written = _make_sample(in_path, size, skew=skew)
+            mb = written / 2**20
+            print(f"input: {mb:.1f} MB, {skew:.0%} one repeated line")
+            for mem in (written * MEMORY_OVERHEAD, written // 4, written // 32):
+                start = perf_counter()
+                stats = dedup_file(in_path, out_path, mem=mem)
+                seconds = perf_counter() - start
+                print(f"--mem {mem / 2**20:>8.1f}M  buckets {stats['buckets']:>4}  "
+                      f"{mb / seconds:>8.1f} MB/s  kept {stats['lines_kept']:,} lines")
+
+            # peak Python memory for the smallest budget (tracemalloc is slow: separate run)
+            tracemalloc.start()
+            dedup_file(in_path, out_path, mem=mem)
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            print(f"--mem {mem / 2**20:>8.1f}M  peak {peak / 2**20:.1f} MB\n")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Remove duplicate lines from a file, keeping the first "
+                    "occurrence and the original order, within a memory budget.")
+    parser.add_argument("input", nargs="?")
+    parser.add_argument("output", nargs="?")
+    parser.add_argument("--mem", default="256M", help="memory budget, e.g. 512K, 256M, 2G")
+    parser.add_argument("--tmp", default=None, help="directory for temporary buckets")
+    parser.add_argument("--bench", metavar="SIZE", help="benchmark on a generated file of SIZE")
+    args = parser.parse_args(argv)
+
+    if args.bench:
+        benchmark(parse_size(args.bench))
+        return 0
+    if not args.input or not args.output:
+        parser.error("input and output are required (or use --bench)")
+
+    start = perf_counter()
+    stats = dedup_file(args.input, args.output, mem=parse_size(args.mem), tmp_dir=args.tmp)
+    seconds = perf_counter() - start
+    mb = os.path.getsize(args.input) / 2**20
+    print(f"{mb:.1f} MB in {seconds:.2f} s ({mb / seconds:.1f} MB/s), "
+          f"{stats['buckets']} buckets, {stats['lines_kept']:,} unique lines", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,274 @@
+# ============================================================
+#        EXERCISE 003 (EXTRA) — STREAMING UNIQUE ELEMENTS
+# ============================================================
+# Companion to exercise_003_unique_elements.py
+#
+# Problem:
+#   The exercise shows four ways to drop duplicates:
+#     1) "value not in new_list"   -> O(n**2), slow for big lists
+#     2) set(numbers)              -> fast, but order is lost
+#     3) dict.fromkeys(numbers)    -> fast, order kept
+#     4) OrderedDict.fromkeys(...) -> same idea, older style
+#   All of them need the whole input (and the whole result) in memory.
+#
+# Idea:
+#   unique() is a generator. It remembers what it has seen in a set
+#   and yields each new value right away, so it works on any
+#   iterable (files, sockets, other generators) and keeps order.
+#
+#   - key=    : dedup by key(item) instead of the item itself.
+#               This is also how unhashable items (lists, dicts)
+#               can be deduplicated fast, e.g. key=tuple.
+#   - Unhashable items without a key still work, but they are
+#     compared one by one (slow path, like version 1).
+#   - capacity= : bounded-memory mode. "seen" becomes a Bloom filter
+#     with a fixed size, so memory does not grow with the stream.
+#     Trade-off: with probability ~error_rate a NEW item is taken for
+#     a duplicate and skipped. Duplicates are never let through, as
+#     long as equal items hash alike: numbers compare by value, str,
+#     bytes, tuples, lists and sets by content, but any other type by
+#     repr() (pass key= for objects with their own __eq__).
+#     Memory is about capacity * 1.44 * log2(1 / error_rate) bits,
+#     e.g. 10**9 items at 1% error -> ~1.2 GB.
+#     It is slow: every item is hashed and its bits are set in
+#     Python, about 0.2-0.3 M items/s, some 50-100 times slower than
+#     the set. Use it only when the set does not fit in memory.
+#
+# Run:
+#   python unique_stream.py [max_power]     (demo + benchmark)
+# ============================================================
+
+import math
+import sys
+from collections import OrderedDict
+from decimal import Decimal
+from fractions import Fraction
+from hashlib import blake2b
+from math import ceil, log
+from time import perf_counter
+
+
+MASK64 = (1 << 64) - 1
+
+
+def _blake64(data, person):
+    return int.from_bytes(blake2b(data, digest_size=8, person=person).digest(), "little")
+
+
+# 64-bit hash that gives equal items the same value, like set does,
+# without hash()'s built-in collisions (hash(-1) == hash(-2)).
+#   - numbers are compared by value: 1 == 1.0 == True, and
+#     1.5 == Fraction(3, 2) == Decimal("1.5")
+#   - tuples, lists and (frozen)sets are hashed from their items
+#   - any other type is hashed by repr(): equal objects with different
+#     reprs count as different (pass key= to unique() for those)
+# Also used by unique_count_approx.py, so its counts agree with set().
+def hash64(item):
+    if isinstance(item, int) and -(1 << 63) <= item < 1 << 63:
+        # splitmix64 finalizer: spreads consecutive ints over all bits
+        z = (item + 0x9E3779B97F4A7C15) & MASK64
+        z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & MASK64
+        z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & MASK64
+        return z ^ (z >> 31)
+    # `person` keeps "a", b"a", 1, "1" and a repr() that reads "a" apart
+    if isinstance(item, str):
+        return _blake64(item.encode("utf-8", "surrogatepass"), b"str")
+    if isinstance(item, (bytes, bytearray, memoryview)):
+        return _blake64(item, b"bytes")
+    if isinstance(item, (int, float, complex, Fraction, Decimal)):
+        value = _exact_number(item)
+        if isinstance(value, int):
+            return hash64(value) if -(1 << 63) <= value < 1 << 63 else _blake64(str(value).encode(), b"int")
+        return _blake64(str(value).encode(), b"number")
+    if isinstance(item, (tuple, list)):
+        children = b"".join(hash64(x).to_bytes(8, "little") for x in item)
+        return _blake64(children, b"tuple" if isinstance(item, tuple) else b"list")
+    if isinstance(item, (set, frozenset)):
+        children = b"".join(h.to_bytes(8, "little") for h in sorted(map(hash64, item)))
+        return _blake64(children, b"set")
+    return _blake64(repr(item).encode("utf-8", "surrogatepass"), b"repr")
+
+
+# A number as an int if it is whole, else as an exact Fraction
+# (a str for inf and nan, and for complex numbers with an imaginary part).
+def _exact_number(x):
+    if isinstance(x, complex):
+        if x.imag:
+            return repr(x)
+        x = x.real
+    if isinstance(x, int):
+        return x
+    if isinstance(x, float) and not math.isfinite(x) or isinstance(x, Decimal) and not x.is_finite():
+        return str(float(x))  # "inf", "-inf" or "nan", the same for float and Decimal
+    value = Fraction(x)
+    return value.numerator if value.denominator == 1 else value
+
+
+# ------------------------------------------------------------
+# Bloom filter — fixed-size "probably seen" set
+# ------------------------------------------------------------
+
+class BloomFilter:
+    def __init__(self, capacity, error_rate=0.01):
+        if capacity < 1:
+            raise ValueError("capacity must be positive")
+        if not 0 < error_rate < 1:
+            raise ValueError("error_rate must be between 0 and 1")
+        self.num_bits = max(8, ceil(-capacity * log(error_rate) / log(2) ** 2))
+        self.num_hashes = max(1, round(self.num_bits / capacity * log(2)))
+        self.bits = bytearray((self.num_bits + 7) // 8)
+
+    # Two base hashes, combined into k positions (double hashing).
+    # Both come from one 64-bit hash that does not go through hash():
+    # hash() collides on purpose (hash(-1) == hash(-2), hash(2**61 - 1)
+    # == hash(0)), and every collision would drop a new item.
+    @staticmethod
+    def _base_hashes(item):
+        h = hash64(item)
+        return h & 0xFFFFFFFF, (h >> 32) | 1
+
+    # Set the item's bits; return True if they were all set already.
+    def add(self, item):
+        h1, h2 = self._base_hashes(item)
+        bits = self.bits
+        m = self.num_bits
+        present = True
+        for i in range(self.num_hashes):
+            pos = (h1 + i * h2) % m
+            mask = 1 << (pos & 7)
+            if not bits[pos >> 3] & mask:
+                present = False
+                bits[pos >> 3] |= mask
+        return present
+
+    def __contains__(self, item):
+        h1, h2 = self._base_hashes(item)
+        bits = self.bits
+        m = self.num_bits
+        for i in range(self.num_hashes):
+            pos = (h1 + i * h2) % m
+            if not bits[pos >> 3] & (1 << (pos & 7)):
+                return False
+        return True
+
+
+# ------------------------------------------------------------
+# unique() — lazy, order-preserving
+# ------------------------------------------------------------
+
+def unique(iterable, key=None, capacity=None, error_rate=0.01):
+    if capacity is not None:
+        yield from _unique_bounded(iterable, key, capacity, error_rate)
+        return
+
+    seen = set()
+    seen_add = seen.add
+    seen_unhashable = []
+
+    if key is None:
+        for item in iterable:
+            try:
+                if item not in seen:
+                    seen_add(item)
+                    yield item
+            except TypeError:
+                # unhashable: fall back to a slow linear check
+                if item not in seen_unhashable:
+                    seen_unhashable.append(item)
+                    yield item
+    else:
+        for item in iterable:
+            k = key(item)
+            try:
+                if k not in seen:
+                    seen_add(k)
+                    yield item
+            except TypeError:
+                if k not in seen_unhashable:
+                    seen_unhashable.append(k)
+                    yield item
+
+
+def _unique_bounded(iterable, key, capacity, error_rate):
+    seen = BloomFilter(capacity, error_rate)
+    for item in iterable:
+        k = item if key is None else key(item)
+        if not seen.add(k):
+            yield item
+
+
+# ------------------------------------------------------------
+# The four approaches from exercise_003, as functions
+# ------------------------------------------------------------
+
+def unique_not_in(numbers):
+    new_list = []
+    for value in numbers:
+        if value not in new_list:
+            new_list.append(value)
+    return new_list
+
+
+def unique_set(numbers):
+    return list(set(numbers))
+
+
+def unique_dict_fromkeys(numbers):
+    return list(dict.fromkeys(numbers))
+
+
+def unique_ordered_dict(numbers):
+    return list(OrderedDict.fromkeys(numbers))
+
+
+def unique_generator(numbers):
+    return list(unique(numbers))
+
+
+def unique_bloom(numbers):
+    return list(unique(numbers, capacity=len(numbers)))
+
+
+if __name__ == "__main__":
+    numbers = [8, 1, 8, 6, 3, 9, 3, 2, 11, 6]
+
+    print("\n# -----------------------------")
+    print("# unique() on the exercise data")
+    print("# -----------------------------\n")
+
+    print(list(unique(numbers)))                       # [8, 1, 6, 3, 9, 2, 11]
+    print(list(unique([[1, 2], [3], [1, 2]], key=tuple)))  # [[1, 2], [3]]
+    print(list(unique([[1, 2], [3], [1, 2]])))         # slow path, same result
+    print(list(unique(["a", "B", "b", "A"], key=str.lower)))  # ['a', 'B']
+    print(list(unique(numbers, capacity=100)))         # bounded memory
+    print(list(unique([0, 2**61 - 1, -1, -2], capacity=100)))  # equal hash(), all kept
+    print(list(unique([(1,), (1.0,), 1.5, Fraction(3, 2), Decimal("1.5")], capacity=100)))  # [(1,), 1.5]
+
+    print("\n# -----------------------------")
+    print("# Benchmark (half of the values are duplicates)")
+    print("# -----------------------------\n")
+
+    max_power = int(sys.argv[1]) if len(sys.argv) > 1 else 6
+    approaches = [
+        ("not in (O(n**2))", unique_not_in),
+        ("set", unique_set),
+        ("dict.fromkeys", unique_dict_fromkeys),
+        ("OrderedDict", unique_ordered_dict),
+        ("unique()", unique_generator),
+        ("unique(capacity=)", unique_bloom),
+    ]
+
+    print(f"{'n':>10}  " + "  ".join(f"{name:>18}" for name, _ in approaches))
+    for power in range(3, max_power + 1):
+        n = 10 ** power
+        data = [i % (n // 2) for i in range(n)]
+        cells = []
+        for name, func in approaches:
+            if func is unique_not_in and n > 10 ** 4:
+                cells.append(f"{'skipped':>18}")  # would take minutes
+                continue
+            start = perf_counter()
+            func(data)
+            seconds = perf_counter() - start
+            cells.append(f"{n / seconds:>14,.0f} /s ")
+        print(f"{n:>10}  " + "  ".join(cells))